@@ -1,30 +1,43 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Depends, status, Request, Response
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Depends, Header, status, Request, Response
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from starlette.background import BackgroundTask
 from pydantic import BaseModel, EmailStr
 import uvicorn
 import os
 import json
+import re
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+from typing import AsyncIterator, Callable, Literal, Optional, List, Dict, Tuple
 from pathlib import Path
 import bcrypt
+import hashlib
 import logging
+import secrets
 import uuid
 import aiofiles
 import shutil
 import asyncio
-import threading
+import tempfile
 import time
-from transcribe_audio import AudioTranscriber
-from docx import Document
-import httpx
+import zipfile
+from contextlib import aclosing, asynccontextmanager
 from dotenv import load_dotenv
 
-# Load environment variables
+# Load environment variables (before the modules below read their settings)
 load_dotenv()
 
+from events import event_bus
+from storage import HTTPStore, WORKER_TABLES, open_store
+from status_cache import StatusCache
+from job_queue import HTTPJobQueue, SQLiteJobQueue, WorkerPool
+from llm_cache import response_cache, response_cache_key
+from transcript_cache import transcript_cache
+from transcribe_audio import AudioTranscriber, IncompleteTranscriptionError, TranscriptionProgress, close_async_stt_clients, shutdown_decode_pool
+from docx_report import render_docx_report, shutdown_render_pool
+import httpx
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -36,47 +49,70 @@ TEXT_API_URL = os.getenv("TEXT_API_URL")
 if not WHISPER_API_URL or not TEXT_API_URL:
     raise ValueError("WHISPER_API_URL and TEXT_API_URL must be set in .env file")
 
-# Create necessary directories
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
-DATA_DIR = Path("data")
-DATA_DIR.mkdir(exist_ok=True)
-REPORTS_DIR = Path("reports")
-REPORTS_DIR.mkdir(exist_ok=True)
-
-# Data storage files
-USERS_FILE = DATA_DIR / "users.json"
-UPLOADS_FILE = DATA_DIR / "uploads.json"
-TRANSCRIPTS_FILE = DATA_DIR / "transcripts.json"
-JOBS_FILE = DATA_DIR / "jobs.json"
-REPORTS_FILE = DATA_DIR / "reports.json"
-
-# Initialize storage files if they don't exist
-def init_storage_file(file_path: Path, default_data: Dict = None):
-    if not file_path.exists():
-        with open(file_path, 'w') as f:
-            json.dump(default_data or {}, f)
+# Longer transcripts are summarised in parts of this many characters before the report is written
+REPORT_CHUNK_CHARS = int(os.getenv("REPORT_CHUNK_CHARS", "6000"))
+# Transcript parts summarised at the same time by one report job
+REPORT_MAP_CONCURRENCY = int(os.getenv("REPORT_MAP_CONCURRENCY", "4"))
+# Model name served at TEXT_API_URL
+TEXT_MODEL = "llm_model"
+# Token limit of each part's notes and of the report itself
+REPORT_NOTES_MAX_TOKENS = 800
+REPORT_MAX_TOKENS = 2000
+# Rounds of summarising notes that are still too long for the final request
+REPORT_MAX_MAP_ROUNDS = 3
+# Seconds the text model may go without sending a token before the request fails
+LLM_TOKEN_TIMEOUT = float(os.getenv("LLM_TOKEN_TIMEOUT", "60"))
+# Minimum seconds between updates of a report's partial text while it is written
+REPORT_PREVIEW_INTERVAL = 1.0
+# Keep-alive connection pool of the text model client, shared by every report job
+TEXT_POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=120.0)
+# Talk HTTP/2 to the text model (needs the h2 package: pip install httpx[http2])
+TEXT_API_HTTP2 = os.getenv("TEXT_API_HTTP2", "0") == "1"
 
-init_storage_file(USERS_FILE)
-init_storage_file(UPLOADS_FILE)
-init_storage_file(TRANSCRIPTS_FILE)
-init_storage_file(JOBS_FILE)
-init_storage_file(REPORTS_FILE)
+# Create necessary directories (local disk: the SQLite databases in DATA_DIR must not be on a network filesystem).
+# On worker nodes (WORKER_API_URL) they only hold files of running jobs and the STT and text model caches.
+UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "uploads"))
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+DATA_DIR = Path(os.getenv("DATA_DIR", "data"))
+DATA_DIR.mkdir(parents=True, exist_ok=True)
+REPORTS_DIR = Path(os.getenv("REPORTS_DIR", "reports"))
+REPORTS_DIR.mkdir(parents=True, exist_ok=True)
 
-def load_data(file_path: Path) -> Dict:
-    try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        logger.error(f"Error loading data from {file_path}: {str(e)}")
-        return {}
+# Set on worker nodes on other hosts (worker.py): the API server whose queue, records and files they use
+WORKER_API_URL = os.getenv("WORKER_API_URL")
+# Shared secret of the API server and its worker nodes; the /internal worker API is disabled without it
+WORKER_TOKEN = os.getenv("WORKER_TOKEN")
+if WORKER_API_URL and not WORKER_TOKEN:
+    raise ValueError("WORKER_TOKEN must be set with WORKER_API_URL")
 
-def save_data(file_path: Path, data: Dict):
-    try:
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
-    except Exception as e:
-        logger.error(f"Error saving data to {file_path}: {str(e)}")
+# Data storage (users, uploads, jobs, transcripts and reports)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sqlite")  # "sqlite" or "json"
+DATABASE_PATH = Path(os.getenv("DATABASE_PATH", str(DATA_DIR / "app.db")))
+if WORKER_API_URL:
+    store = HTTPStore(WORKER_API_URL, WORKER_TOKEN)
+else:
+    store = open_store(STORAGE_BACKEND, DATA_DIR, DATABASE_PATH)
+    # Import records from the JSON files used before the database
+    store.migrate_json(DATA_DIR)
+
+# Job and report records, cached in memory so progress polling does not touch storage
+jobs_cache = StatusCache(store, "jobs")
+reports_cache = StatusCache(store, "reports")
+
+# Durable queue of transcription and report jobs, and the number of workers running each kind
+QUEUE_PATH = Path(os.getenv("QUEUE_PATH", str(DATA_DIR / "queue.db")))
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", "4"))
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "2"))
+# Reports that one /generate-reports request may start
+BATCH_MAX_REPORTS = int(os.getenv("BATCH_MAX_REPORTS", "50"))
+# Reports of one batch generated at a time, so a batch leaves report workers free for other users
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "1"))
+# Set to 0 on API servers that leave all jobs to separate worker processes (worker.py)
+RUN_WORKERS = os.getenv("RUN_WORKERS", "1") != "0"
+if WORKER_API_URL:
+    job_queue = HTTPJobQueue(WORKER_API_URL, WORKER_TOKEN)
+else:
+    job_queue = SQLiteJobQueue(QUEUE_PATH, group_limit=BATCH_CONCURRENCY)
 
 # Models
 class UserLogin(BaseModel):
@@ -98,9 +134,12 @@ class User(BaseModel):
 class TranscribeRequest(BaseModel):
     file_id: str
     title: str
-    max_workers: int = 6
+    max_workers: int = 6  # Hint only: STT capacity is shared between jobs by the global scheduler
     model_name: str = "Whisper Malaysia"
     language: str = "auto"
+    streaming: bool = True
+    # "vad" cuts segments on pauses in speech; opt-in until it has been proven on real recordings
+    segmentation: Literal["fixed", "vad"] = "fixed"
 
 class TranscriptUpdate(BaseModel):
     text: str
@@ -109,9 +148,21 @@ class GenerateReportRequest(BaseModel):
     transcript_id: str
     prompt: str
     title: str
+    # False to always ask the text model again instead of reusing an identical earlier response
+    use_cache: bool = True
+
+class GenerateReportBatchRequest(BaseModel):
+    items: List[GenerateReportRequest]
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if RUN_WORKERS:
+        start_job_workers()
+    yield
+    await stop_job_workers()
 
 # Create FastAPI app instance
-app = FastAPI(title="PDRM Meeting Minutes Assistant")
+app = FastAPI(title="PDRM Meeting Minutes Assistant", lifespan=lifespan)
 
 # Add CORS middleware
 origins = [
@@ -146,305 +197,759 @@ app.add_middleware(
     ],
 )
 
-# Storage dictionaries (now backed by files)
+# Storage dictionaries (now backed by the database)
 upload_progress = {}  # This can stay in memory as it's temporary
 
-def process_transcription(job_id: str):
-    """Process transcription using AudioTranscriber."""
+# Seconds between keep-alive comments on idle /events streams
+SSE_KEEPALIVE_INTERVAL = 15.0
+
+# Seconds between checks of /events items for changes made by worker processes
+SSE_POLL_INTERVAL = 1.0
+
+# Statuses after which an /events item is no longer checked
+SSE_FINAL_STATUSES = ("completed", "error", "not_found")
+
+def job_status_payload(job_id: str, job: Dict) -> Dict:
+    """Status of a transcription job as returned by /progress and pushed on /events."""
+    return {
+        "id": job_id,
+        "status": job["status"],
+        "progress": job["progress"],
+        "message": job["message"],
+        "segments_done": job.get("segments_done"),
+        "segments_total": job.get("segments_total"),
+        "eta_seconds": job.get("eta_seconds"),
+        "missing_segments": job.get("missing_segments", [])
+    }
+
+def report_status_payload(report_id: str, report: Dict) -> Dict:
+    """Status of a report job as returned by /reports/{id}/progress and pushed on /events."""
+    return {
+        "id": report_id,
+        "status": report["status"],
+        "progress": report["progress"],
+        "message": report["message"]
+    }
+
+def publish_job_status(job_id: str, job: Dict):
+    """Push a transcription job's current status to /events subscribers."""
+    event_bus.publish(f"job:{job_id}", job_status_payload(job_id, job))
+
+def publish_report_status(report_id: str, report: Dict):
+    """Push a report job's current status to /events subscribers (safe from any thread)."""
+    event_bus.publish(f"report:{report_id}", report_status_payload(report_id, report))
+
+def update_job(job_id: str, fields: Dict, persist: bool = True) -> Optional[Dict]:
+    """
+    Update fields of a transcription job and push its new status.
+    
+    With persist=False the change is only batched for a later write, for frequent
+    progress updates that do not change the job's status.
+    """
+    job = jobs_cache.update(job_id, fields, persist=persist)
+    if job is not None:
+        publish_job_status(job_id, job)
+    return job
+
+def update_report(report_id: str, fields: Dict, persist: bool = True) -> Optional[Dict]:
+    """
+    Store changed fields of a report job and push its new status.
+    
+    With persist=False the change is only batched for a later write, for the partial
+    report text that changes with every few tokens.
+    """
+    report = reports_cache.update(report_id, fields, persist=persist)
+    if report is not None:
+        publish_report_status(report_id, report)
+    return report
+
+def make_progress_callback(job_id: str):
+    """
+    Build a transcribe_file_async progress callback for a job.
+    
+    Every tick updates the cached job; the cache writes progress to storage in batches.
+    """
+    highest = 0
+    
+    def on_progress(progress: TranscriptionProgress):
+        nonlocal highest
+        if progress.segments_total:
+            # Hold at 99% until the transcript has been stored
+            highest = max(highest, min(99, progress.segments_done * 100 // progress.segments_total))
+        
+        message = f"Mentranskripsi segmen {progress.segments_done}/{progress.segments_total}"
+        if progress.eta_seconds is not None:
+            message += f" (anggaran {max(1, round(progress.eta_seconds / 60))} minit lagi)"
+        
+        update_job(job_id, {
+            "progress": highest,
+            "message": message,
+            "segments_done": progress.segments_done,
+            "segments_total": progress.segments_total,
+            "eta_seconds": None if progress.eta_seconds is None else round(progress.eta_seconds)
+        }, persist=False)
+    
+    return on_progress
+
+def transcript_cache_key(audio_hash: str, settings: Dict) -> str:
+    """Key of the cached transcript for an audio file transcribed with the given job settings."""
+    # Only settings that change the STT output; streaming and max_workers do not
+    parts = [
+        audio_hash,
+        settings["model_name"],
+        settings["language"],
+        AudioTranscriber().segmentation_signature(settings["segmentation"])
+    ]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+@asynccontextmanager
+async def local_job_audio(job_id: str, job: Dict) -> AsyncIterator[str]:
+    """Yield the local path of a job's uploaded audio; worker nodes download it from the API server first."""
+    if not WORKER_API_URL:
+        yield job["file_path"]
+        return
+    path = UPLOAD_DIR / f"{job_id}_{Path(job['file_path']).name}"
+    await store.download(f"/internal/jobs/{job_id}/audio", path)
     try:
-        jobs = load_data(JOBS_FILE)
-        job = jobs[job_id]
-        job["status"] = "processing"
-        save_data(JOBS_FILE, jobs)
+        yield str(path)
+    finally:
+        path.unlink(missing_ok=True)
+
+async def cache_transcript(cache_key: str, text: str):
+    """Keep a complete transcript for repeat uploads; worker nodes add it to the API server's cache."""
+    if WORKER_API_URL:
+        store.put("transcript_cache", cache_key, {"text": text})
+    else:
+        await transcript_cache.aput(cache_key, text)
+
+async def process_transcription(job_id: str):
+    """Process transcription using AudioTranscriber on the event loop."""
+    try:
+        job = update_job(job_id, {"status": "processing"})
         
-        # Create AudioTranscriber instance
+        # Create AudioTranscriber instance (cheap: STT clients are shared process-wide)
         transcriber = AudioTranscriber()
         
-        # Get file path and settings
-        file_path = job["file_path"]
+        # Get settings
         settings = job["settings"]
         
         # Update progress for initialization
-        job["progress"] = 0
-        job["message"] = "Memulakan transkripsi..."
-        save_data(JOBS_FILE, jobs)
+        update_job(job_id, {"progress": 0, "message": "Memulakan transkripsi..."})
         
         # Start transcription
         try:
             # Transcribe the file
-            transcription = transcriber.transcribe_file(
-                audio_path=file_path,
-                max_workers=settings["max_workers"],
-                model_name=settings["model_name"],
-                language=settings["language"],
-                format="txt"  # We want plain text output
-            )
-            
-            # Update job status
-            job["status"] = "completed"
-            job["progress"] = 100
-            job["message"] = "Transkrip selesai"
-            save_data(JOBS_FILE, jobs)
+            try:
+                async with local_job_audio(job_id, job) as file_path:
+                    transcription = await transcriber.transcribe_file_async(
+                        audio_path=file_path,
+                        max_concurrency=settings["max_workers"],
+                        model_name=settings["model_name"],
+                        language=settings["language"],
+                        streaming=settings.get("streaming", True),
+                        segmentation=settings.get("segmentation", "fixed"),
+                        job_id=job_id,
+                        progress_callback=make_progress_callback(job_id),
+                        format="txt"  # We want plain text output
+                    )
+                missing_segments = []
+            except IncompleteTranscriptionError as e:
+                # Keep what was transcribed and record the gaps instead of dropping them silently
+                logger.warning(f"Transcription {job_id} is missing {len(e.missing_segments)} segment(s)")
+                transcription = e.transcript
+                missing_segments = e.missing_segments
             
-            # Store the transcript
-            transcripts = load_data(TRANSCRIPTS_FILE)
-            transcripts[job_id] = {
+            # Store the transcript before announcing completion, so clients can fetch it right away
+            store.put("transcripts", job_id, {
                 "text": transcription,
                 "title": settings["title"]
-            }
-            save_data(TRANSCRIPTS_FILE, transcripts)
+            })
+            
+            # Repeat uploads of the same recording can reuse a complete transcript; an empty one
+            # is more likely a segmentation problem than silence, so it is transcribed again
+            if not missing_segments and transcription.strip() and job.get("cache_key"):
+                await cache_transcript(job["cache_key"], transcription)
+            
+            # Update job status, keeping the final segment counts
+            if missing_segments:
+                message = f"Transkrip selesai, {len(missing_segments)} segmen gagal ditranskripsi"
+            else:
+                message = "Transkrip selesai"
+            update_job(job_id, {
+                "status": "completed",
+                "progress": 100,
+                "missing_segments": missing_segments,
+                "message": message
+            })
             
         except Exception as e:
             logger.error(f"Transcription error: {str(e)}")
-            job["status"] = "error"
-            job["message"] = f"Ralat semasa transkripsi: {str(e)}"
-            job["progress"] = 0
-            save_data(JOBS_FILE, jobs)
+            update_job(job_id, {
+                "status": "error",
+                "message": f"Ralat semasa transkripsi: {str(e)}",
+                "progress": 0
+            })
             
     except Exception as e:
         logger.error(f"Error in transcription process: {str(e)}")
-        jobs = load_data(JOBS_FILE)
-        if job_id in jobs:
-            jobs[job_id]["status"] = "error"
-            jobs[job_id]["message"] = "Ralat semasa pemprosesan"
-            save_data(JOBS_FILE, jobs)
-
-async def generate_report_content(transcript_text: str, prompt: str) -> str:
-    """Generate report content using Malaysian text model."""
-    try:
-        # Log request details
-        logger.info(f"Making request to text model at: {TEXT_API_URL}")
-        logger.info(f"Transcript length: {len(transcript_text)}")
-        logger.info(f"Prompt length: {len(prompt)}")
+        update_job(job_id, {"status": "error", "message": "Ralat semasa pemprosesan"})
 
-        # Create client with more specific timeout settings - increased for LLM processing
-        timeout = httpx.Timeout(connect=30.0, read=300.0, write=30.0, pool=30.0)
-        
-        async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-            # Prepare request payload
-            payload = {
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": """Anda adalah penulis laporan profesional. Tugas anda adalah menganalisis transkrip yang diberikan
+# Long-lived text model client, created on first use on the job workers' event loop
+text_client: Optional[httpx.AsyncClient] = None
+
+def get_text_client() -> httpx.AsyncClient:
+    """Return the pooled HTTP client for TEXT_API_URL, creating it on first use."""
+    global text_client
+    if text_client is None:
+        # Responses are streamed, so the read timeout is the longest wait for the next token
+        timeout = httpx.Timeout(connect=30.0, read=LLM_TOKEN_TIMEOUT, write=30.0, pool=30.0)
+        http2 = TEXT_API_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("TEXT_API_HTTP2 is set but the h2 package is not installed; using HTTP/1.1")
+                http2 = False
+        text_client = httpx.AsyncClient(timeout=timeout, limits=TEXT_POOL_LIMITS, http2=http2, follow_redirects=True)
+    return text_client
+
+async def close_text_client():
+    """Close the text model client, e.g. on application shutdown."""
+    global text_client
+    if text_client is not None:
+        await text_client.aclose()
+        text_client = None
+
+# Sentence ends, for splitting transcript lines that are too long for one request
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+REPORT_SYSTEM_PROMPT = """Anda adalah penulis laporan profesional. Tugas anda adalah menganalisis transkrip yang diberikan
                         dan membuat laporan berstruktur mengikut format yang diberikan. Laporan tersebut mestilah jelas,
                         profesional, dan mengikut format yang betul. Gunakan bullet points di mana sesuai."""
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Berikut adalah transkrip:\n\n{transcript_text[:4000]}\n\nSila buat laporan mengikut format ini:\n\n{prompt}"
-                    }
-                ],
-                "model": "llm_model",
-                "temperature": 0.7,
-                "max_tokens": 2000
+
+NOTES_SYSTEM_PROMPT = """Anda adalah pencatat minit mesyuarat. Ringkaskan bahagian transkrip yang diberikan dalam bentuk
+                        bullet points. Kekalkan semua keputusan, tindakan susulan, nama, jawatan, tarikh, angka dan isu
+                        yang dibincangkan. Jangan tambah maklumat yang tiada dalam transkrip."""
+
+def split_transcript(text: str, max_chars: int) -> List[str]:
+    """
+    Split a transcript into parts of at most max_chars characters.
+    
+    Parts break between transcript lines where possible, then between sentences,
+    and only cut inside a sentence that is longer than max_chars on its own.
+    """
+    pieces = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if len(line) <= max_chars:
+            pieces.append(line)
+            continue
+        for sentence in SENTENCE_END.split(line):
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(" ", 0, max_chars)
+                if cut <= 0:
+                    cut = max_chars
+                pieces.append(sentence[:cut])
+                sentence = sentence[cut:].lstrip()
+            if sentence:
+                pieces.append(sentence)
+    
+    parts = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > max_chars:
+            parts.append(current)
+            current = piece
+        else:
+            current = f"{current}\n{piece}" if current else piece
+    if current:
+        parts.append(current)
+    return parts
+
+async def chat_completion(client: httpx.AsyncClient, messages: List[Dict], max_tokens: int, temperature: float = 0.7, token_callback: Callable[[str, int], None] = None, use_cache: bool = True) -> str:
+    """
+    Send one chat completion request to the text model, streaming the response.
+    
+    Tokens are accumulated as they arrive. The client's read timeout applies between
+    chunks of the stream, so a server that stops sending tokens fails after
+    LLM_TOKEN_TIMEOUT seconds instead of after the whole response's time budget.
+    Responses are kept in response_cache, and an identical request is answered from it.
+    
+    Args:
+        client: HTTP client to send the request with
+        messages: Chat messages
+        max_tokens: Maximum tokens to generate
+        temperature: Sampling temperature
+        token_callback: Called with (content so far, tokens received) after each token
+        use_cache: Reuse a cached response; if False the response is still cached
+        
+    Returns:
+        The generated content
+    """
+    payload = {
+        "messages": messages,
+        "model": TEXT_MODEL,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "stream": True
+    }
+    
+    cache_key = response_cache_key(messages, TEXT_MODEL, temperature, max_tokens)
+    if use_cache:
+        cached = await response_cache.aget(cache_key)
+        if cached is not None:
+            logger.info(f"Reusing cached text model response of length: {len(cached)}")
+            if token_callback:
+                token_callback(cached, max_tokens)
+            return cached
+    
+    logger.info(f"Request payload prepared, making POST to: {TEXT_API_URL}/chat/completions")
+
+    # Make request with detailed error handling
+    try:
+        async with client.stream(
+            "POST",
+            f"{TEXT_API_URL}/chat/completions",
+            json=payload,
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "text/event-stream",
+                "User-Agent": "PDRM-Minutes-App/1.0"
             }
+        ) as response:
+            # Log response status
+            logger.info(f"Text model response status: {response.status_code}")
             
-            logger.info(f"Request payload prepared, making POST to: {TEXT_API_URL}/chat/completions")
-
-            # Make request with detailed error handling
-            try:
-                response = await client.post(
-                    f"{TEXT_API_URL}/chat/completions",
-                    json=payload,
-                    headers={
-                        "Content-Type": "application/json",
-                        "Accept": "application/json",
-                        "User-Agent": "PDRM-Minutes-App/1.0"
-                    }
-                )
-                
-                # Log response status
-                logger.info(f"Text model response status: {response.status_code}")
-                logger.info(f"Response headers: {dict(response.headers)}")
-                
-                # Handle non-200 responses
-                if response.status_code != 200:
-                    logger.error(f"Non-200 response: {response.status_code}")
-                    logger.error(f"Response content: {response.text}")
-                    raise Exception(f"Text model API returned status {response.status_code}")
-                
-                # Parse response
-                try:
-                    result = response.json()
-                    logger.info("Successfully parsed response JSON")
-                    logger.info(f"Response keys: {list(result.keys())}")
-                except Exception as e:
-                    logger.error(f"Error parsing response JSON: {str(e)}")
-                    logger.error(f"Response content: {response.text}")
-                    raise Exception("Invalid JSON response from text model")
-                
-                # Validate response structure
-                if "choices" not in result:
-                    logger.error(f"Missing 'choices' in response. Available keys: {list(result.keys())}")
-                    logger.error(f"Full response: {result}")
-                    raise Exception("Invalid response structure from text model")
-                
-                if not result["choices"]:
-                    logger.error("Empty choices array in response")
-                    raise Exception("No content generated by text model")
-                
-                if "message" not in result["choices"][0]:
-                    logger.error(f"Missing 'message' in first choice: {result['choices'][0]}")
-                    raise Exception("Invalid response format from text model")
-                
-                if "content" not in result["choices"][0]["message"]:
-                    logger.error(f"Missing 'content' in message: {result['choices'][0]['message']}")
-                    raise Exception("Invalid response content from text model")
-                
-                content = result["choices"][0]["message"]["content"]
-                logger.info(f"Successfully generated content of length: {len(content)}")
-                return content
+            # Handle non-200 responses
+            if response.status_code != 200:
+                await response.aread()
+                logger.error(f"Non-200 response: {response.status_code}")
+                logger.error(f"Response content: {response.text}")
+                raise Exception(f"Text model API returned status {response.status_code}")
+            
+            # Server-sent events: "data: {chunk}" lines, ending with "data: [DONE]"
+            content = ""
+            tokens = 0
+            finished = False
+            async with aclosing(response.aiter_lines()) as lines:
+                async for line in lines:
+                    # Read the stream to its end even after [DONE], so the connection can be reused
+                    if finished or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        finished = True
+                        continue
+                    
+                    try:
+                        chunk = json.loads(data)
+                    except ValueError:
+                        logger.error(f"Invalid stream chunk from text model: {data}")
+                        raise Exception("Invalid JSON response from text model")
+                    
+                    # Some servers end with a chunk that only carries usage
+                    choices = chunk.get("choices") or []
+                    if not choices:
+                        continue
+                    text = (choices[0].get("delta") or {}).get("content")
+                    if text:
+                        content += text
+                        tokens += 1
+                        if token_callback:
+                            token_callback(content, tokens)
+        
+        if not content:
+            logger.error("Text model stream ended without content")
+            raise Exception("No content generated by text model")
+        
+        await response_cache.aput(cache_key, content)
+        return content
 
-            except httpx.TimeoutException as e:
-                logger.error(f"Timeout error to text model: {str(e)}")
-                raise Exception("Request to text model API timed out")
-                
-            except httpx.HTTPStatusError as e:
-                logger.error(f"HTTP error from text model: {e.response.status_code}")
-                logger.error(f"Response content: {e.response.text}")
-                raise Exception(f"Text model API error: {e.response.status_code}")
-
-            except httpx.ConnectError as e:
-                logger.error(f"Connection error to text model: {str(e)}")
-                logger.error(f"Full error details: {repr(e)}")
-                raise Exception(f"Failed to connect to text model API: {str(e)}")
-                
-            except httpx.RequestError as e:
-                logger.error(f"Request error to text model: {str(e)}")
-                logger.error(f"Full error details: {repr(e)}")
-                logger.error(f"Error type: {type(e).__name__}")
-                raise Exception(f"Request error to text model API: {str(e)}")
+    except httpx.TimeoutException as e:
+        logger.error(f"Timeout error to text model: {str(e)}")
+        raise Exception("Request to text model API timed out")
+        
+    except httpx.HTTPStatusError as e:
+        logger.error(f"HTTP error from text model: {e.response.status_code}")
+        logger.error(f"Response content: {e.response.text}")
+        raise Exception(f"Text model API error: {e.response.status_code}")
 
-    except Exception as e:
-        logger.error(f"Error generating report content: {str(e)}")
+    except httpx.ConnectError as e:
+        logger.error(f"Connection error to text model: {str(e)}")
+        logger.error(f"Full error details: {repr(e)}")
+        raise Exception(f"Failed to connect to text model API: {str(e)}")
+        
+    except httpx.RequestError as e:
+        logger.error(f"Request error to text model: {str(e)}")
+        logger.error(f"Full error details: {repr(e)}")
         logger.error(f"Error type: {type(e).__name__}")
-        raise Exception(f"Failed to generate report content: {str(e)}")
+        raise Exception(f"Request error to text model API: {str(e)}")
 
-def create_docx_report(title: str, prompt: str, content: str) -> Document:
-    """Create a DOCX document with the report content."""
-    doc = Document()
+async def summarise_transcript(client: httpx.AsyncClient, transcript_text: str, progress_callback: Callable[[int, int, int], None] = None, use_cache: bool = True) -> str:
+    """
+    Condense a long transcript into notes that fit in one report request (map step).
     
-    # Add logo to the top of the document
-    try:
-        from docx.shared import Inches
-        from docx.enum.text import WD_ALIGN_PARAGRAPH
-        
-        # Create a paragraph for the logo
-        logo_paragraph = doc.add_paragraph()
-        logo_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        # Add logo image
-        logo_path = Path("static/asset/logo.png")
-        if logo_path.exists():
-            run = logo_paragraph.runs[0] if logo_paragraph.runs else logo_paragraph.add_run()
-            run.add_picture(str(logo_path), width=Inches(2.5))
-        else:
-            # Fallback if logo not found
-            logo_paragraph.add_run("POLIS DIRAJA MALAYSIA").bold = True
-            
-        # Add some space after logo
-        doc.add_paragraph()
+    The transcript is split into parts of REPORT_CHUNK_CHARS, which are summarised
+    concurrently, at most REPORT_MAP_CONCURRENCY at a time. If the joined notes are
+    still too long, they are summarised again the same way.
+    
+    Args:
+        client: HTTP client to send the requests with
+        transcript_text: Full transcript
+        progress_callback: Called with (parts done, total parts, round number) after each part
+        use_cache: Reuse cached notes of identical parts
         
-    except Exception as e:
-        logger.warning(f"Could not add logo to document: {str(e)}")
-        # Add text header as fallback
-        header_para = doc.add_paragraph("POLIS DIRAJA MALAYSIA")
-        header_para.runs[0].bold = True
-        header_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        doc.add_paragraph()
+    Returns:
+        The notes of every part, in transcript order
+    """
+    semaphore = asyncio.Semaphore(REPORT_MAP_CONCURRENCY)
+    text = transcript_text
     
-    # Add title
-    title_para = doc.add_heading(f"{title}", 0)
-    title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    for round_number in range(1, REPORT_MAX_MAP_ROUNDS + 1):
+        parts = split_transcript(text, REPORT_CHUNK_CHARS)
+        if len(parts) <= 1:
+            break
+        logger.info(f"Summarising transcript in {len(parts)} part(s) (round {round_number})")
+        done = 0
+        
+        async def summarise_part(index: int, part: str) -> str:
+            nonlocal done
+            async with semaphore:
+                notes = await chat_completion(client, [
+                    {"role": "system", "content": NOTES_SYSTEM_PROMPT},
+                    {"role": "user", "content": f"Berikut adalah bahagian {index + 1} daripada {len(parts)} transkrip:\n\n{part}"}
+                ], max_tokens=REPORT_NOTES_MAX_TOKENS, temperature=0.3, use_cache=use_cache)
+            done += 1
+            if progress_callback:
+                progress_callback(done, len(parts), round_number)
+            return notes.strip()
+        
+        notes = await asyncio.gather(*(summarise_part(i, part) for i, part in enumerate(parts)))
+        text = "\n".join(notes)
+        if len(text) <= REPORT_CHUNK_CHARS:
+            break
     
-    # Add content directly without showing the prompt
-    # Split content by lines and add them to document
-    for line in content.split('\n'):
-        if line.strip():
-            # Check if line is a heading (starts with #)
-            if line.startswith('#'):
-                level = line.count('#')
-                text = line.strip('#').strip()
-                doc.add_heading(text, level)
-            else:
-                # Check if line is a bullet point
-                if line.strip().startswith('- ') or line.strip().startswith('* '):
-                    doc.add_paragraph(line.strip('- ').strip('* '), style='List Bullet')
-                else:
-                    doc.add_paragraph(line)
+    return text
+
+async def generate_report_content(transcript_text: str, prompt: str, progress_callback: Callable[[int, int, int], None] = None, token_callback: Callable[[str, int], None] = None, use_cache: bool = True) -> str:
+    """
+    Generate report content using Malaysian text model.
+    
+    Transcripts up to REPORT_CHUNK_CHARS are sent whole. Longer ones are first
+    condensed into notes part by part (see summarise_transcript), and the report is
+    written from the notes, so the whole meeting is covered without one huge request.
     
-    return doc
+    Args:
+        transcript_text: Full transcript
+        prompt: Report format requested by the user
+        progress_callback: Called with (parts done, total parts, round number) while a long transcript is summarised
+        token_callback: Called with (report so far, tokens received) while the report is written
+        use_cache: Reuse cached text model responses for identical requests
+        
+    Returns:
+        The report content
+    """
+    try:
+        # Log request details
+        logger.info(f"Making request to text model at: {TEXT_API_URL}")
+        logger.info(f"Transcript length: {len(transcript_text)}")
+        logger.info(f"Prompt length: {len(prompt)}")
+
+        # Connections are kept alive and reused across the requests of every report
+        client = get_text_client()
+        
+        if len(transcript_text) <= REPORT_CHUNK_CHARS:
+            source = f"Berikut adalah transkrip:\n\n{transcript_text}"
+        else:
+            notes = await summarise_transcript(client, transcript_text, progress_callback, use_cache)
+            source = f"Berikut adalah nota ringkasan transkrip mesyuarat, mengikut turutan:\n\n{notes}"
+        
+        content = await chat_completion(client, [
+            {"role": "system", "content": REPORT_SYSTEM_PROMPT},
+            {"role": "user", "content": f"{source}\n\nSila buat laporan mengikut format ini:\n\n{prompt}"}
+        ], max_tokens=REPORT_MAX_TOKENS, token_callback=token_callback, use_cache=use_cache)
+        logger.info(f"Successfully generated content of length: {len(content)}")
+        return content
 
-def process_report_generation(report_id: str):
-    """Process report generation."""
+    except Exception as e:
+        logger.error(f"Error generating report content: {str(e)}")
+        logger.error(f"Error type: {type(e).__name__}")
+        raise Exception(f"Failed to generate report content: {str(e)}")
+
+async def process_report_generation(report_id: str):
+    """Process report generation on the event loop."""
     try:
-        reports = load_data(REPORTS_FILE)
-        report = reports[report_id]
-        report["status"] = "processing"
-        save_data(REPORTS_FILE, reports)
+        report = update_report(report_id, {"status": "processing"})
 
         # Get transcript
-        transcripts = load_data(TRANSCRIPTS_FILE)
-        transcript = transcripts.get(report["transcript_id"])
+        transcript = store.get("transcripts", report["transcript_id"])
         
         if not transcript:
             raise Exception("Transcript not found")
 
         # Update progress
-        reports = load_data(REPORTS_FILE)
-        report = reports[report_id]
-        report["progress"] = 20
-        report["message"] = "Menganalisis transkrip..."
-        save_data(REPORTS_FILE, reports)
+        update_report(report_id, {"progress": 20, "message": "Menganalisis transkrip..."})
+
+        # Summarising a long transcript takes progress to 50; writing the report takes it to 90
+        writing_from = 20
+        last_preview = 0.0
+
+        def on_summary_progress(done: int, total: int, round_number: int):
+            nonlocal writing_from
+            # Each round of the map step takes two thirds of what is left of 20-50 (later rounds
+            # only summarise the notes), so progress never goes back when a round starts
+            start = 50 - 30 / 3 ** (round_number - 1)
+            end = 50 - 30 / 3 ** round_number
+            writing_from = max(writing_from, int(start + (end - start) * done / total))
+            update_report(report_id, {
+                "progress": writing_from,
+                "message": f"Meringkaskan transkrip ({done}/{total} bahagian)..."
+            })
+
+        def on_token(content: str, tokens: int):
+            nonlocal last_preview
+            now = time.monotonic()
+            if now - last_preview < REPORT_PREVIEW_INTERVAL:
+                return
+            last_preview = now
+            update_report(report_id, {
+                "progress": writing_from + (90 - writing_from) * min(tokens, REPORT_MAX_TOKENS) // REPORT_MAX_TOKENS,
+                "message": "Menulis laporan...",
+                "preview": content
+            }, persist=False)
 
         # Generate report content using LLM
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        content = loop.run_until_complete(
-            generate_report_content(transcript["text"], report["prompt"])
+        content = await generate_report_content(
+            transcript["text"], report["prompt"], on_summary_progress, on_token, use_cache=report.get("use_cache", True)
         )
-        loop.close()
 
         # Update progress
-        reports = load_data(REPORTS_FILE)
-        report = reports[report_id]
-        report["progress"] = 60
-        report["message"] = "Menjana dokumen laporan..."
-        save_data(REPORTS_FILE, reports)
+        update_report(report_id, {"progress": 90, "message": "Menjana dokumen laporan...", "preview": content})
 
-        # Create DOCX document
-        doc = create_docx_report(report["title"], report["prompt"], content)
-        
-        # Save document
-        report_path = REPORTS_DIR / f"{report_id}.docx"
-        doc.save(str(report_path))
+        # Render and save the DOCX document in the render process pool
+        report_path = await render_docx_report(
+            REPORTS_DIR / f"{report_id}.docx", report["title"], report["prompt"], content
+        )
+        if WORKER_API_URL:
+            # The API server keeps the document and serves its downloads
+            rendered = Path(report_path)
+            try:
+                report_path = (await store.upload(f"/internal/reports/{report_id}/document", rendered))["file_path"]
+            finally:
+                rendered.unlink(missing_ok=True)
 
         # Update report status
-        reports = load_data(REPORTS_FILE)
-        report = reports[report_id]
-        report["status"] = "completed"
-        report["progress"] = 100
-        report["message"] = "Laporan selesai"
-        report["file_path"] = str(report_path)
-        save_data(REPORTS_FILE, reports)
+        update_report(report_id, {
+            "status": "completed",
+            "progress": 100,
+            "message": "Laporan selesai",
+            "file_path": str(report_path)
+        })
 
     except Exception as e:
         logger.error(f"Report generation error: {str(e)}")
-        reports = load_data(REPORTS_FILE)
-        if report_id in reports:
-            reports[report_id]["status"] = "error"
-            reports[report_id]["message"] = f"Ralat semasa menjana laporan: {str(e)}"
-            reports[report_id]["progress"] = 0
-            save_data(REPORTS_FILE, reports)
+        update_report(report_id, {
+            "status": "error",
+            "message": f"Ralat semasa menjana laporan: {str(e)}",
+            "progress": 0
+        })
+
+def give_up_transcription(job_id: str, attempts: int):
+    update_job(job_id, {
+        "status": "error",
+        "message": f"Transkripsi terganggu {attempts} kali dan telah dihentikan",
+        "progress": 0
+    })
+
+def give_up_report(report_id: str, attempts: int):
+    update_report(report_id, {
+        "status": "error",
+        "message": f"Penjanaan laporan terganggu {attempts} kali dan telah dihentikan",
+        "progress": 0
+    })
+
+worker_pool = WorkerPool(
+    job_queue,
+    handlers={"transcription": process_transcription, "report": process_report_generation},
+    workers={"transcription": TRANSCRIPTION_WORKERS, "report": REPORT_WORKERS},
+    on_give_up={"transcription": give_up_transcription, "report": give_up_report}
+)
+
+def requeue_unfinished_jobs():
+    """Queue pending or processing jobs that were started before the job queue existed."""
+    for kind, table in (("transcription", "jobs"), ("report", "reports")):
+        for status in ("pending", "processing"):
+            for job_id in store.find(table, "status", status):
+                if not job_queue.contains(job_id):
+                    logger.info(f"Requeuing unfinished {kind} job {job_id}")
+                    job_queue.enqueue(kind, job_id)
+
+def start_job_workers():
+    """Start this process's job workers on the running event loop."""
+    # Worker nodes leave this to the API server, which holds the queue
+    if not WORKER_API_URL:
+        requeue_unfinished_jobs()
+    worker_pool.start()
+
+async def stop_job_workers():
+    """Stop the job workers and release the resources used by jobs."""
+    # Running jobs go back to the queue and resume on the next start
+    await worker_pool.stop()
+    # Write batched progress updates before exiting
+    jobs_cache.flush()
+    reports_cache.flush()
+    # Release the pooled STT and text model connections used by jobs on this event loop
+    await close_async_stt_clients()
+    await close_text_client()
+    await asyncio.to_thread(shutdown_decode_pool)
+    await asyncio.to_thread(shutdown_render_pool)
+
+# Worker API: worker nodes on other hosts (worker.py with WORKER_API_URL) lease jobs from this
+# server's queue, read and write records and fetch and return job files through these endpoints
+
+class WorkerLease(BaseModel):
+    worker: str
+    error: Optional[str] = None
+
+class QueuedJob(BaseModel):
+    job_id: str
+    group: Optional[str] = None
+
+def require_worker_token(authorization: Optional[str] = Header(None)):
+    """Admit only worker nodes holding WORKER_TOKEN to the /internal endpoints."""
+    if not WORKER_TOKEN:
+        # Without a token the worker API does not exist
+        raise HTTPException(status_code=404, detail="Not Found")
+    if authorization is None or not secrets.compare_digest(authorization.encode(), f"Bearer {WORKER_TOKEN}".encode()):
+        raise HTTPException(status_code=401, detail="Invalid worker token")
+
+def check_job_kind(kind: str):
+    if kind not in worker_pool.handlers:
+        raise HTTPException(status_code=404, detail="Unknown job kind")
+
+def worker_status_cache(table: str) -> Optional[StatusCache]:
+    """
+    Return the status cache of a worker table, or None if it has none.
+    
+    Job and report records go through their caches, so that updates from worker nodes
+    reach this server's /events subscribers as they happen.
+    """
+    if table not in WORKER_TABLES:
+        raise HTTPException(status_code=404, detail="Unknown table")
+    return {"jobs": jobs_cache, "reports": reports_cache}.get(table)
+
+@app.post("/internal/queue/{kind}/jobs", dependencies=[Depends(require_worker_token)])
+async def worker_enqueue(kind: str, job: QueuedJob):
+    check_job_kind(kind)
+    worker_pool.submit(kind, job.job_id, job.group)
+    return {"job_id": job.job_id}
+
+@app.post("/internal/queue/{kind}/claim", dependencies=[Depends(require_worker_token)])
+async def worker_claim(kind: str, lease: WorkerLease):
+    check_job_kind(kind)
+    claimed = await asyncio.to_thread(job_queue.claim, kind, lease.worker)
+    if claimed is None:
+        return None
+    job_id, attempt = claimed
+    return {"job_id": job_id, "attempt": attempt, "lease_seconds": job_queue.lease_seconds}
+
+@app.post("/internal/queue/jobs/{job_id}/heartbeat", dependencies=[Depends(require_worker_token)])
+async def worker_heartbeat(job_id: str, lease: WorkerLease):
+    return {"held": await asyncio.to_thread(job_queue.heartbeat, job_id, lease.worker)}
+
+@app.post("/internal/queue/jobs/{job_id}/complete", dependencies=[Depends(require_worker_token)])
+async def worker_complete(job_id: str, lease: WorkerLease):
+    await asyncio.to_thread(job_queue.complete, job_id, lease.worker)
+    return {"job_id": job_id}
+
+@app.post("/internal/queue/jobs/{job_id}/fail", dependencies=[Depends(require_worker_token)])
+async def worker_fail(job_id: str, lease: WorkerLease):
+    await asyncio.to_thread(job_queue.fail, job_id, lease.worker, lease.error or "")
+    return {"job_id": job_id}
+
+@app.post("/internal/queue/jobs/{job_id}/release", dependencies=[Depends(require_worker_token)])
+async def worker_release(job_id: str, lease: WorkerLease):
+    await asyncio.to_thread(job_queue.release, job_id, lease.worker)
+    return {"job_id": job_id}
+
+@app.get("/internal/store/{table}/{key}", dependencies=[Depends(require_worker_token)])
+async def worker_get_record(table: str, key: str):
+    cache = worker_status_cache(table)
+    if table == "transcript_cache":
+        text = await transcript_cache.aget(key)
+        record = {"text": text} if text is not None else None
+    else:
+        record = cache.get(key) if cache is not None else store.get(table, key)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Record not found")
+    return record
+
+@app.put("/internal/store/{table}/{key}", dependencies=[Depends(require_worker_token)])
+async def worker_put_record(table: str, key: str, record: Dict):
+    cache = worker_status_cache(table)
+    if table == "transcript_cache":
+        await transcript_cache.aput(key, record["text"])
+    elif cache is not None:
+        cache.put(key, record)
+    else:
+        store.put(table, key, record)
+    return record
+
+@app.patch("/internal/store/{table}/{key}", dependencies=[Depends(require_worker_token)])
+async def worker_update_record(table: str, key: str, fields: Dict):
+    worker_status_cache(table)
+    if table == "transcript_cache":
+        raise HTTPException(status_code=405, detail="Cached transcripts cannot be updated")
+    if table == "jobs":
+        record = update_job(key, fields)
+    elif table == "reports":
+        record = update_report(key, fields)
+    else:
+        record = store.update(table, key, fields)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Record not found")
+    return record
+
+@app.delete("/internal/store/{table}/{key}", dependencies=[Depends(require_worker_token)])
+async def worker_delete_record(table: str, key: str):
+    cache = worker_status_cache(table)
+    if table == "transcript_cache":
+        await transcript_cache.adelete(key)
+    elif not (cache.delete(key) if cache is not None else store.delete(table, key)):
+        raise HTTPException(status_code=404, detail="Record not found")
+    return {"id": key}
+
+@app.get("/internal/jobs/{job_id}/audio", dependencies=[Depends(require_worker_token)])
+async def worker_job_audio(job_id: str):
+    job = jobs_cache.get(job_id)
+    if job is None or not Path(job["file_path"]).exists():
+        raise HTTPException(status_code=404, detail="Audio file not found")
+    return FileResponse(path=job["file_path"], media_type="application/octet-stream")
+
+@app.put("/internal/reports/{report_id}/document", dependencies=[Depends(require_worker_token)])
+async def worker_report_document(report_id: str, request: Request):
+    if reports_cache.get(report_id) is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    report_path = REPORTS_DIR / f"{report_id}.docx"
+    # Written under another name first, so a broken upload never leaves a truncated document
+    part_path = REPORTS_DIR / f"{report_id}.docx.part"
+    try:
+        async with aiofiles.open(part_path, "wb") as f:
+            async for chunk in request.stream():
+                await f.write(chunk)
+        os.replace(part_path, report_path)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+    return {"file_path": str(report_path)}
 
 @app.post("/register", response_model=User)
 async def register(user_data: UserCreate):
     try:
         logger.info(f"Received registration request for username: {user_data.username}")
         
-        users = load_data(USERS_FILE)
-        
         # Validate passwords match
         if user_data.password != user_data.confirm_password:
             logger.warning("Password mismatch")
@@ -453,27 +958,28 @@ async def register(user_data: UserCreate):
                 detail="Passwords do not match"
             )
         
-        # Check if username exists
-        if user_data.username in users:
-            logger.warning(f"Username {user_data.username} already exists")
-            raise HTTPException(
-                status_code=400,
-                detail="Username already registered"
-            )
-
         # Hash password
         hashed = bcrypt.hashpw(user_data.password.encode(), bcrypt.gensalt())
         
-        # Store user
-        users[user_data.username] = {
-            "username": user_data.username,
-            "email": user_data.email,
-            "full_name": user_data.full_name,
-            "hashed_password": hashed.decode(),  # Convert bytes to string for JSON storage
-            "created_at": datetime.now().isoformat(),
-            "last_login": None
-        }
-        save_data(USERS_FILE, users)
+        # Check and store in one transaction so concurrent registrations cannot both succeed
+        with store.transaction("users") as users:
+            # Check if username exists
+            if user_data.username in users:
+                logger.warning(f"Username {user_data.username} already exists")
+                raise HTTPException(
+                    status_code=400,
+                    detail="Username already registered"
+                )
+            
+            # Store user
+            users[user_data.username] = {
+                "username": user_data.username,
+                "email": user_data.email,
+                "full_name": user_data.full_name,
+                "hashed_password": hashed.decode(),  # Convert bytes to string for JSON storage
+                "created_at": datetime.now().isoformat(),
+                "last_login": None
+            }
         
         logger.info(f"Successfully registered user: {user_data.username}")
         return {
@@ -496,16 +1002,13 @@ async def register(user_data: UserCreate):
 async def login(user_data: UserLogin):
     logger.info(f"Login attempt for email: {user_data.email}")
     
-    users = load_data(USERS_FILE)
-    
     # Find user by email
     user = None
     username = None
-    for uname, udata in users.items():
-        if udata.get("email", "").lower() == user_data.email.lower():
-            user = udata
-            username = uname
-            break
+    for uname, udata in store.find("users", "email", user_data.email).items():
+        user = udata
+        username = uname
+        break
     
     if not user:
         logger.warning(f"User not found with email: {user_data.email}")
@@ -522,8 +1025,7 @@ async def login(user_data: UserLogin):
         )
     
     # Update last login
-    users[username]["last_login"] = datetime.now().isoformat()
-    save_data(USERS_FILE, users)
+    store.update("users", username, {"last_login": datetime.now().isoformat()})
     
     logger.info(f"Successful login for email: {user_data.email}")
     return {
@@ -542,26 +1044,27 @@ async def upload_file(file: UploadFile = File(...)):
         file_path = UPLOAD_DIR / f"{file_id}_{file.filename}"
         logger.info(f"Saving file to: {file_path}")
         
-        # Save file with progress tracking
+        # Save file with progress tracking, hashing the content as it is written
         file_size = 0
         chunk_size = 8192  # 8KB chunks
+        hasher = hashlib.sha256()
         
         async with aiofiles.open(file_path, 'wb') as f:
             while chunk := await file.read(chunk_size):
                 await f.write(chunk)
+                hasher.update(chunk)
                 file_size += len(chunk)
                 upload_progress[file_id] = min(99, int((file_size / file.size) * 100))
         
         upload_progress[file_id] = 100
         
         # Store file info
-        uploads = load_data(UPLOADS_FILE)
-        uploads[file_id] = {
+        store.put("uploads", file_id, {
             "filename": file.filename,
             "path": str(file_path),
-            "size": file_size
-        }
-        save_data(UPLOADS_FILE, uploads)
+            "size": file_size,
+            "sha256": hasher.hexdigest()
+        })
         
         logger.info(f"File saved successfully. ID: {file_id}, Path: {file_path}")
         return {
@@ -595,10 +1098,9 @@ async def transcribe_audio(request: TranscribeRequest):
         logger.info(f"Received transcription request for file ID: {request.file_id}")
         
         # Check if file exists
-        uploads = load_data(UPLOADS_FILE)
-        file_info = uploads.get(request.file_id)
+        file_info = store.get("uploads", request.file_id)
         if not file_info:
-            logger.error(f"File not found in uploaded_files. Available IDs: {list(uploads.keys())}")
+            logger.error(f"File not found in uploads: {request.file_id}")
             raise HTTPException(
                 status_code=404,
                 detail="File not found"
@@ -616,27 +1118,53 @@ async def transcribe_audio(request: TranscribeRequest):
         # Generate unique request ID
         request_id = str(uuid.uuid4())
         
+        settings = {
+            "max_workers": request.max_workers,
+            "model_name": request.model_name,
+            "language": request.language,
+            "streaming": request.streaming,
+            "segmentation": request.segmentation,
+            "title": request.title
+        }
+        # Uploads from before content hashing have no cache key
+        cache_key = transcript_cache_key(file_info["sha256"], settings) if file_info.get("sha256") else None
+        
+        # Same recording already transcribed with the same settings: reuse it without any STT calls
+        cached = await transcript_cache.aget(cache_key) if cache_key else None
+        if cached is not None:
+            store.put("transcripts", request_id, {
+                "text": cached,
+                "title": request.title
+            })
+            jobs_cache.put(request_id, {
+                "status": "completed",
+                "file_name": file_info["filename"],
+                "file_path": str(file_path),
+                "settings": settings,
+                "cache_key": cache_key,
+                "progress": 100,
+                "message": "Transkrip selesai (daripada cache)",
+                "missing_segments": []
+            })
+            logger.info(f"Reused cached transcript for job: {request_id}")
+            return {
+                "request_id": request_id,
+                "message": "Transcription reused from cache"
+            }
+        
         # Save transcription job info
-        jobs = load_data(JOBS_FILE)
-        jobs[request_id] = {
+        jobs_cache.put(request_id, {
             "status": "pending",
             "file_name": file_info["filename"],
             "file_path": str(file_path),
-            "settings": {
-                "max_workers": request.max_workers,
-                "model_name": request.model_name,
-                "language": request.language,
-                "title": request.title
-            },
+            "settings": settings,
+            "cache_key": cache_key,
             "progress": 0,
             "message": "Memulakan transkripsi..."
-        }
-        save_data(JOBS_FILE, jobs)
+        })
         
-        # Start transcription in a background thread
-        thread = threading.Thread(target=process_transcription, args=(request_id,))
-        thread.daemon = True  # Make thread daemon so it doesn't block shutdown
-        thread.start()
+        # Queue the transcription for the next free worker
+        worker_pool.submit("transcription", request_id)
         
         logger.info(f"Created transcription job: {request_id}")
         
@@ -657,111 +1185,195 @@ async def transcribe_audio(request: TranscribeRequest):
 
 @app.get("/progress/{request_id}")
 async def get_progress(request_id: str):
-    jobs = load_data(JOBS_FILE)
-    if request_id not in jobs:
+    job = jobs_cache.get(request_id)
+    if job is None:
         raise HTTPException(
             status_code=404,
             detail="Transcription job not found"
         )
     
-    job = jobs[request_id]
-    return {
-        "status": job["status"],
-        "progress": job["progress"],
-        "message": job["message"]
-    }
+    return job_status_payload(request_id, job)
+
+def format_sse(event: str, data: Dict) -> str:
+    """Encode one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.get("/events")
+async def stream_events(request: Request, jobs: str = "", reports: str = ""):
+    """
+    Server-Sent Events stream of status changes for comma-separated job and report IDs.
+    
+    The current status of every requested item is sent first, followed by each change
+    as it is published. Unknown IDs are reported once with status "not_found".
+    Updates from worker nodes on other hosts arrive through this server and are
+    published too, but jobs run by worker processes on this host publish nothing
+    here, so the stored status of items that this process is not running and that
+    have not finished is also checked every SSE_POLL_INTERVAL seconds.
+    """
+    job_ids = [job_id for job_id in jobs.split(",") if job_id]
+    report_ids = [report_id for report_id in reports.split(",") if report_id]
+    
+    # Subscribe before reading the snapshot so no change in between is missed
+    subscription = event_bus.subscribe(
+        [f"job:{job_id}" for job_id in job_ids] + [f"report:{report_id}" for report_id in report_ids]
+    )
+    
+    # Last status sent per item, so each change is sent once however it was noticed
+    last_sent = {}
+    
+    def needs_poll(kind: str, item_id: str, cache: StatusCache) -> bool:
+        # Jobs run here publish every change, and finished ones do not change any more
+        if cache.is_owned(item_id):
+            return False
+        return last_sent.get((kind, item_id), {}).get("status") not in SSE_FINAL_STATUSES
+    
+    def current_statuses(polling: bool = False):
+        for job_id in job_ids:
+            if polling and not needs_poll("job", job_id, jobs_cache):
+                continue
+            job = jobs_cache.get(job_id)
+            if job is not None:
+                yield "job", job_status_payload(job_id, job)
+            else:
+                yield "job", {"id": job_id, "status": "not_found"}
+        for report_id in report_ids:
+            if polling and not needs_poll("report", report_id, reports_cache):
+                continue
+            report = reports_cache.get(report_id)
+            if report is not None:
+                yield "report", report_status_payload(report_id, report)
+            else:
+                yield "report", {"id": report_id, "status": "not_found"}
+    
+    def is_new(kind: str, data: Dict) -> bool:
+        key = (kind, data["id"])
+        if last_sent.get(key) == data:
+            return False
+        last_sent[key] = data
+        return True
+    
+    async def event_stream():
+        try:
+            for kind, data in current_statuses():
+                if is_new(kind, data):
+                    yield format_sse(kind, data)
+            
+            last_poll = last_write = time.monotonic()
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=SSE_POLL_INTERVAL)
+                updates = []
+                if event is not None:
+                    topic, data = event
+                    updates.append((topic.split(":", 1)[0], data))
+                
+                now = time.monotonic()
+                if now - last_poll >= SSE_POLL_INTERVAL:
+                    last_poll = now
+                    updates.extend(current_statuses(polling=True))
+                
+                for kind, data in updates:
+                    if is_new(kind, data):
+                        yield format_sse(kind, data)
+                        last_write = now
+                if now - last_write >= SSE_KEEPALIVE_INTERVAL:
+                    yield ": keep-alive\n\n"
+                    last_write = now
+        finally:
+            subscription.close()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/transcripts/{transcript_id}")
 async def get_transcript(transcript_id: str):
-    transcripts = load_data(TRANSCRIPTS_FILE)
-    if transcript_id not in transcripts:
+    transcript = store.get("transcripts", transcript_id)
+    if transcript is None:
         raise HTTPException(
             status_code=404,
             detail="Transcript not found"
         )
     
-    return transcripts[transcript_id]
+    return transcript
 
 @app.put("/transcripts/{transcript_id}")
 async def update_transcript(transcript_id: str, update: TranscriptUpdate):
-    transcripts = load_data(TRANSCRIPTS_FILE)
-    if transcript_id not in transcripts:
+    transcript = store.update("transcripts", transcript_id, {"text": update.text})
+    if transcript is None:
         raise HTTPException(
             status_code=404,
             detail="Transcript not found"
         )
     
-    transcripts[transcript_id]["text"] = update.text
-    save_data(TRANSCRIPTS_FILE, transcripts)
-    return transcripts[transcript_id]
+    return transcript
 
 @app.delete("/transcripts/{transcript_id}")
 async def delete_transcript(transcript_id: str):
-    transcripts = load_data(TRANSCRIPTS_FILE)
-    if transcript_id not in transcripts:
+    # Delete transcript
+    if not store.delete("transcripts", transcript_id):
         raise HTTPException(
             status_code=404,
             detail="Transcript not found"
         )
     
-    # Delete transcript
-    del transcripts[transcript_id]
-    save_data(TRANSCRIPTS_FILE, transcripts)
-    
-    # Delete associated job if exists
-    jobs = load_data(JOBS_FILE)
-    if transcript_id in jobs:
-        del jobs[transcript_id]
-        save_data(JOBS_FILE, jobs)
+    # Delete associated job if exists, and its cached copy, so a new upload of the same recording is transcribed again
+    job = jobs_cache.get(transcript_id)
+    if job is not None and job.get("cache_key"):
+        await transcript_cache.adelete(job["cache_key"])
+    jobs_cache.delete(transcript_id)
     
     # Delete associated file if exists
-    uploads = load_data(UPLOADS_FILE)
-    if transcript_id in uploads:
-        file_info = uploads[transcript_id]
+    file_info = store.get("uploads", transcript_id)
+    if file_info is not None:
         file_path = Path(file_info["path"])
         if file_path.exists():
             file_path.unlink()
-        del uploads[transcript_id]
-        save_data(UPLOADS_FILE, uploads)
+        store.delete("uploads", transcript_id)
     
     return {"message": "Transcript deleted successfully"}
 
+def create_report_job(request: GenerateReportRequest, batch_id: Optional[str] = None) -> str:
+    """Store a new report job and queue it for the report workers. Returns the report ID."""
+    # Generate unique report ID
+    report_id = str(uuid.uuid4())
+    
+    # Save report job info
+    report = {
+        "id": report_id,  # Add ID to the report data
+        "status": "pending",
+        "transcript_id": request.transcript_id,
+        "prompt": request.prompt,
+        "title": request.title,
+        "use_cache": request.use_cache,
+        "progress": 0,
+        "message": "Memulakan penjanaan laporan...",
+        "created_at": datetime.now().isoformat()
+    }
+    if batch_id is not None:
+        report["batch_id"] = batch_id
+    reports_cache.put(report_id, report)
+    
+    # Queue the report for the next free worker; a batch's reports are queued as one group
+    worker_pool.submit("report", report_id, batch_id)
+    
+    logger.info(f"Created report generation job: {report_id}")
+    return report_id
+
 @app.post("/generate-report")
 async def generate_report(request: GenerateReportRequest):
     try:
         logger.info(f"Received report generation request for transcript ID: {request.transcript_id}")
         
         # Check if transcript exists
-        transcripts = load_data(TRANSCRIPTS_FILE)
-        if request.transcript_id not in transcripts:
+        if store.get("transcripts", request.transcript_id) is None:
             raise HTTPException(
                 status_code=404,
                 detail="Transcript not found"
             )
 
-        # Generate unique report ID
-        report_id = str(uuid.uuid4())
-        
-        # Save report job info
-        reports = load_data(REPORTS_FILE)
-        reports[report_id] = {
-            "id": report_id,  # Add ID to the report data
-            "status": "pending",
-            "transcript_id": request.transcript_id,
-            "prompt": request.prompt,
-            "title": request.title,
-            "progress": 0,
-            "message": "Memulakan penjanaan laporan...",
-            "created_at": datetime.now().isoformat()
-        }
-        save_data(REPORTS_FILE, reports)
-        
-        # Start report generation in a background thread
-        thread = threading.Thread(target=process_report_generation, args=(report_id,))
-        thread.daemon = True
-        thread.start()
-        
-        logger.info(f"Created report generation job: {report_id}")
+        report_id = create_report_job(request)
         
         return {
             "report_id": report_id,
@@ -780,30 +1392,39 @@ async def generate_report(request: GenerateReportRequest):
 
 @app.get("/reports/{report_id}/progress")
 async def get_report_progress(report_id: str):
-    reports = load_data(REPORTS_FILE)
-    if report_id not in reports:
+    report = reports_cache.get(report_id)
+    if report is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Report not found"
+        )
+    
+    return report_status_payload(report_id, report)
+
+@app.get("/reports/{report_id}/preview")
+async def get_report_preview(report_id: str):
+    """Text of a report written so far, available while the text model is still writing it."""
+    report = reports_cache.get(report_id)
+    if report is None:
         raise HTTPException(
             status_code=404,
             detail="Report not found"
         )
     
-    report = reports[report_id]
     return {
-        "status": report["status"],
-        "progress": report["progress"],
-        "message": report["message"]
+        **report_status_payload(report_id, report),
+        "content": report.get("preview", "")
     }
 
 @app.get("/reports/{report_id}")
 async def get_report(report_id: str):
-    reports = load_data(REPORTS_FILE)
-    if report_id not in reports:
+    report = reports_cache.get(report_id)
+    if report is None:
         raise HTTPException(
             status_code=404,
             detail="Report not found"
         )
     
-    report = reports[report_id]
     if report["status"] != "completed":
         raise HTTPException(
             status_code=400,
@@ -825,23 +1446,22 @@ async def get_report(report_id: str):
 
 @app.get("/reports")
 async def list_reports():
-    reports = load_data(REPORTS_FILE)
+    reports = store.all("reports")
     return [
-        {**report, "id": report_id}  # Add ID to each report
+        # Add ID to each report; the report text is left to /reports/{id}/preview
+        {**{key: value for key, value in report.items() if key != "preview"}, "id": report_id}
         for report_id, report in reports.items()
     ]
 
 @app.delete("/reports/{report_id}")
 async def delete_report(report_id: str):
-    reports = load_data(REPORTS_FILE)
-    if report_id not in reports:
+    report = store.get("reports", report_id)
+    if report is None:
         raise HTTPException(
             status_code=404,
             detail="Report not found"
         )
     
-    report = reports[report_id]
-    
     # Delete report file if exists
     if "file_path" in report:
         file_path = Path(report["file_path"])
@@ -849,11 +1469,171 @@ async def delete_report(report_id: str):
             file_path.unlink()
     
     # Delete report record
-    del reports[report_id]
-    save_data(REPORTS_FILE, reports)
+    reports_cache.delete(report_id)
     
     return {"message": "Report deleted successfully"}
 
+@app.post("/generate-reports")
+async def generate_report_batch(request: GenerateReportBatchRequest):
+    """
+    Start several reports at once, e.g. every format of one meeting or one format of several meetings.
+    
+    The reports are queued like single reports and share the text model connection
+    pool, but at most BATCH_CONCURRENCY of them run at once, so reports requested
+    by other users while the batch runs are not held up behind it. Their
+    combined progress is at /report-batches/{id} and the documents can be
+    downloaded as one ZIP file.
+    """
+    try:
+        if not request.items:
+            raise HTTPException(
+                status_code=400,
+                detail="No reports requested"
+            )
+        if len(request.items) > BATCH_MAX_REPORTS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {BATCH_MAX_REPORTS} reports can be requested at once"
+            )
+        
+        # Check every transcript before queueing anything
+        missing = sorted({
+            item.transcript_id for item in request.items
+            if store.get("transcripts", item.transcript_id) is None
+        })
+        if missing:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Transcript not found: {', '.join(missing)}"
+            )
+        
+        batch_id = str(uuid.uuid4())
+        report_ids = [create_report_job(item, batch_id) for item in request.items]
+        store.put("report_batches", batch_id, {
+            "id": batch_id,
+            "report_ids": report_ids,
+            "created_at": datetime.now().isoformat()
+        })
+        
+        logger.info(f"Created report batch {batch_id} with {len(report_ids)} report(s)")
+        
+        return {
+            "batch_id": batch_id,
+            "report_ids": report_ids,
+            "message": "Report generation started"
+        }
+        
+    except HTTPException as e:
+        raise
+        
+    except Exception as e:
+        logger.error(f"Report batch error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to start report generation: {str(e)}"
+        )
+
+def get_batch_reports(batch_id: str) -> Dict[str, Optional[Dict]]:
+    """Return the reports of a batch by ID (None for deleted ones), or raise 404."""
+    batch = store.get("report_batches", batch_id)
+    if batch is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Report batch not found"
+        )
+    return {report_id: reports_cache.get(report_id) for report_id in batch["report_ids"]}
+
+@app.get("/report-batches/{batch_id}")
+async def get_report_batch_progress(batch_id: str):
+    reports = get_batch_reports(batch_id)
+    
+    statuses = [report["status"] if report else "deleted" for report in reports.values()]
+    completed = statuses.count("completed")
+    failed = statuses.count("error")
+    deleted = statuses.count("deleted")
+    finished = completed + failed + deleted
+    
+    if finished < len(statuses):
+        status = "processing"
+    elif completed == 0:
+        status = "error"
+    else:
+        status = "completed"
+    
+    # Finished reports count as done whether or not they succeeded
+    progress = sum(
+        100 if report is None or report["status"] in ("completed", "error") else report["progress"]
+        for report in reports.values()
+    ) // len(reports)
+    
+    return {
+        "id": batch_id,
+        "status": status,
+        "progress": progress,
+        "total": len(reports),
+        "completed": completed,
+        "failed": failed,
+        "deleted": deleted,
+        "message": f"{completed}/{len(reports)} laporan selesai"
+            + (f", {failed} gagal" if failed else "")
+            + (f", {deleted} dipadam" if deleted else ""),
+        "reports": [
+            report_status_payload(report_id, report) if report else {"id": report_id, "status": "deleted"}
+            for report_id, report in reports.items()
+        ]
+    }
+
+def write_batch_zip(zip_path: str, documents: List[Tuple[str, str]]):
+    """Write (file path, report title) pairs into a ZIP file, one <title>.docx per report (blocking)."""
+    used_names = set()
+    # DOCX files are already compressed
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for file_path, title in documents:
+            base = re.sub(r'[\\/:*?"<>|]+', "_", title).strip() or "Laporan"
+            name = f"{base}.docx"
+            number = 2
+            while name in used_names:
+                name = f"{base} ({number}).docx"
+                number += 1
+            used_names.add(name)
+            archive.write(file_path, name)
+
+@app.get("/report-batches/{batch_id}/download")
+async def download_report_batch(batch_id: str):
+    reports = get_batch_reports(batch_id)
+    
+    if any(report and report["status"] not in ("completed", "error") for report in reports.values()):
+        raise HTTPException(
+            status_code=400,
+            detail="Report batch is not finished yet"
+        )
+    
+    documents = [
+        (report["file_path"], report["title"])
+        for report in reports.values()
+        if report and report["status"] == "completed" and Path(report["file_path"]).exists()
+    ]
+    if not documents:
+        raise HTTPException(
+            status_code=404,
+            detail="No report files in this batch"
+        )
+    
+    fd, zip_path = tempfile.mkstemp(prefix=f"batch-{batch_id}-", suffix=".zip")
+    os.close(fd)
+    try:
+        await asyncio.to_thread(write_batch_zip, zip_path, documents)
+    except BaseException:
+        os.unlink(zip_path)
+        raise
+    
+    return FileResponse(
+        path=zip_path,
+        filename=f"laporan-{batch_id[:8]}.zip",
+        media_type="application/zip",
+        background=BackgroundTask(os.unlink, zip_path)
+    )
+
 @app.post("/logout")
 async def logout():
     logger.info("User logged out")
@@ -863,16 +1643,15 @@ async def logout():
 async def get_statistics():
     """Get comprehensive system statistics."""
     try:
-        users = load_data(USERS_FILE)
-        uploads = load_data(UPLOADS_FILE)
-        transcripts = load_data(TRANSCRIPTS_FILE)
-        jobs = load_data(JOBS_FILE)
-        reports = load_data(REPORTS_FILE)
+        users = store.all("users")
+        uploads = store.all("uploads")
+        jobs = store.all("jobs")
+        reports = store.all("reports")
         
         # Calculate basic counts
         total_users = len(users)
         total_audio_files = len(uploads)
-        total_transcripts = len(transcripts)
+        total_transcripts = store.count("transcripts")
         total_reports = len(reports)
         
         # Calculate transcript status breakdown
@@ -978,7 +1757,7 @@ async def get_statistics():
 async def get_user_statistics(period: str):
     """Get detailed user statistics for a specific period."""
     try:
-        users = load_data(USERS_FILE)
+        users = store.all("users")
         
         if period == "all":
             filtered_users = users
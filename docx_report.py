@@ -0,0 +1,271 @@
+"""
+DOCX documents for generated reports.
+
+Every report starts from the same base document: REPORT_TEMPLATE_PATH if it
+exists, otherwise a document with the PDRM logo built on first use. The base is
+kept in memory as DOCX bytes and cloned per report, so the logo is read and
+embedded only once per process. The report text, which the text model writes in
+markdown, is converted in a single pass over its lines: headings, bulleted and
+numbered lists (nested by indentation), pipe tables and **bold**, *italic* and
+`code` text.
+
+Rendering is CPU-bound and holds the GIL, so render_docx_report runs it in a small
+process pool (RENDER_WORKERS) to keep the API's event loop responsive while large
+reports are built.
+"""
+
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Inches
+
+logger = logging.getLogger(__name__)
+
+# Optional DOCX whose content and styles start every report (e.g. a letterhead)
+REPORT_TEMPLATE_PATH = Path(os.environ.get("REPORT_TEMPLATE_PATH", "static/asset/report_template.docx"))
+
+# Logo placed at the top of the built-in template
+LOGO_PATH = Path("static/asset/logo.png")
+
+# Processes rendering report documents; 0 renders in a thread of the calling process
+RENDER_WORKERS = int(os.environ.get("RENDER_WORKERS", "2"))
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_BULLET = re.compile(r"^(\s*)[-*+]\s+(.*)$")
+_NUMBERED = re.compile(r"^(\s*)(\d+[.)])\s+(.*)$")
+_RULE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+_TABLE_SEPARATOR = re.compile(r"^\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?$")
+_INLINE = re.compile(r"\*\*\*(\S.*?)\*\*\*|\*\*(\S.*?)\*\*|__(\S.*?)__|\*(\S.*?)\*|`(.+?)`")
+
+_template: Optional[bytes] = None
+_template_lock = threading.Lock()
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+_render_lock = threading.Lock()
+
+
+def _build_template() -> bytes:
+    """Build the default base document: the logo (or the force's name) above an empty line."""
+    doc = Document()
+    logo_paragraph = doc.add_paragraph()
+    logo_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    try:
+        if LOGO_PATH.exists():
+            logo_paragraph.add_run().add_picture(str(LOGO_PATH), width=Inches(2.5))
+        else:
+            # Fallback if logo not found
+            logo_paragraph.add_run("POLIS DIRAJA MALAYSIA").bold = True
+    except Exception as e:
+        logger.warning(f"Could not add logo to document: {str(e)}")
+        logo_paragraph.add_run("POLIS DIRAJA MALAYSIA").bold = True
+    # Add some space after logo
+    doc.add_paragraph()
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def report_template() -> bytes:
+    """Return the base document of every report as DOCX bytes, loading it on first use."""
+    global _template
+    with _template_lock:
+        if _template is None:
+            if REPORT_TEMPLATE_PATH.exists():
+                _template = REPORT_TEMPLATE_PATH.read_bytes()
+                logger.info(f"Loaded report template {REPORT_TEMPLATE_PATH}")
+            else:
+                _template = _build_template()
+        return _template
+
+
+class _StyleIds:
+    """
+    Style IDs of a document, looked up by name once.
+
+    python-docx scans every style of the document each time a style is set by name,
+    which made long reports slow to build, so paragraphs get the ID directly.
+    """
+
+    def __init__(self, doc: Document):
+        self.doc = doc
+        self._ids = {}
+
+    def get(self, name: str, level: int = 1) -> Optional[str]:
+        """Return the ID of a style, at a list nesting level ("List Bullet 2") if given, if the document has it."""
+        for candidate in (f"{name} {level}" if level > 1 else name, name):
+            if candidate not in self._ids:
+                try:
+                    self._ids[candidate] = self.doc.styles[candidate].style_id
+                except KeyError:
+                    self._ids[candidate] = None
+            if self._ids[candidate] is not None:
+                return self._ids[candidate]
+        return None
+
+    def add_paragraph(self, name: str = None, level: int = 1):
+        paragraph = self.doc.add_paragraph()
+        style_id = self.get(name, level) if name else None
+        if style_id is not None:
+            paragraph._p.style = style_id
+        return paragraph
+
+
+def _add_inline(paragraph, text: str, bold: bool = False):
+    """Add text to a paragraph, turning inline markdown emphasis into formatted runs."""
+    position = 0
+    for match in _INLINE.finditer(text):
+        if match.start() > position:
+            paragraph.add_run(text[position:match.start()]).bold = bold or None
+        bold_italic, strong, strong_alt, italic, code = match.groups()
+        if bold_italic is not None:
+            run = paragraph.add_run(bold_italic)
+            run.bold = run.italic = True
+        elif strong is not None or strong_alt is not None:
+            paragraph.add_run(strong if strong is not None else strong_alt).bold = True
+        elif italic is not None:
+            run = paragraph.add_run(italic)
+            run.bold = bold or None
+            run.italic = True
+        else:
+            run = paragraph.add_run(code)
+            run.bold = bold or None
+            run.font.name = "Courier New"
+        position = match.end()
+    if position < len(text):
+        paragraph.add_run(text[position:]).bold = bold or None
+
+
+def _table_cells(line: str) -> List[str]:
+    return [cell.strip() for cell in line.strip().strip("|").split("|")]
+
+
+def _add_table(styles: _StyleIds, rows: List[List[str]]):
+    """Add a pipe table; the first row is the header."""
+    columns = max(len(row) for row in rows)
+    table = styles.doc.add_table(rows=len(rows), cols=columns)
+    style_id = styles.get("Table Grid")
+    if style_id is not None:
+        table._tbl.tblStyle_val = style_id
+    for row_index, (row, table_row) in enumerate(zip(rows, table.rows)):
+        for text, cell in zip(row, table_row.cells):
+            _add_inline(cell.paragraphs[0], text, bold=row_index == 0)
+
+
+def _list_level(indent: str) -> int:
+    # Two spaces or a tab per nesting level, up to the three levels Word's list styles have
+    return min(len(indent.replace("\t", "  ")) // 2, 2) + 1
+
+
+def add_markdown(doc: Document, content: str):
+    """Append markdown content to a document."""
+    styles = _StyleIds(doc)
+    table_rows: List[List[str]] = []
+
+    for line in content.split("\n"):
+        line = line.rstrip()
+
+        # Tables are collected row by row and added when they end
+        if line.lstrip().startswith("|"):
+            if not _TABLE_SEPARATOR.match(line.strip()):
+                table_rows.append(_table_cells(line))
+            continue
+        if table_rows:
+            _add_table(styles, table_rows)
+            table_rows = []
+
+        if not line.strip() or _RULE.match(line):
+            continue
+
+        heading = _HEADING.match(line)
+        if heading:
+            styles.add_paragraph(f"Heading {len(heading.group(1))}").add_run(heading.group(2))
+            continue
+
+        numbered = _NUMBERED.match(line)
+        if numbered:
+            # Keep the text's own numbers; Word's automatic numbering would run on between lists
+            paragraph = styles.add_paragraph("List", _list_level(numbered.group(1)))
+            _add_inline(paragraph, f"{numbered.group(2)} {numbered.group(3)}")
+            continue
+
+        bullet = _BULLET.match(line)
+        if bullet:
+            paragraph = styles.add_paragraph("List Bullet", _list_level(bullet.group(1)))
+            _add_inline(paragraph, bullet.group(2))
+            continue
+
+        _add_inline(styles.add_paragraph(), line.strip())
+
+    if table_rows:
+        _add_table(styles, table_rows)
+
+
+def create_docx_report(title: str, prompt: str, content: str) -> Document:
+    """Create a DOCX document with the report content."""
+    doc = Document(io.BytesIO(report_template()))
+
+    # Add title
+    title_para = doc.add_heading(f"{title}", 0)
+    title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    # Add content directly without showing the prompt
+    add_markdown(doc, content)
+    return doc
+
+
+def save_docx_report(report_path: str, title: str, prompt: str, content: str) -> str:
+    """Build a report's DOCX document and write it to report_path (blocking). Returns the path."""
+    doc = create_docx_report(title, prompt, content)
+    doc.save(str(report_path))
+    return str(report_path)
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    """Return the process pool rendering report documents, starting it on first use."""
+    global _render_pool
+    with _render_lock:
+        if _render_pool is None:
+            # Same start method as the decode pool: no forking of a process running threads
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _render_pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS, mp_context=context)
+        return _render_pool
+
+
+def shutdown_render_pool():
+    """Stop the render processes, e.g. on application shutdown."""
+    global _render_pool
+    with _render_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown(cancel_futures=True)
+            _render_pool = None
+
+
+async def render_docx_report(report_path: Path, title: str, prompt: str, content: str) -> str:
+    """
+    Render and save a report's DOCX document without blocking the event loop.
+
+    Args:
+        report_path: File to write
+        title: Report title
+        prompt: Report format requested by the user
+        content: Report text in markdown
+
+    Returns:
+        Path of the written file
+    """
+    if RENDER_WORKERS <= 0:
+        return await asyncio.to_thread(save_docx_report, str(report_path), title, prompt, content)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_render_pool(), save_docx_report, str(report_path), title, prompt, content)
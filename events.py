@@ -0,0 +1,75 @@
+"""
+In-process event bus for job and report status changes.
+
+Background jobs publish to topics such as "job:<id>" and "report:<id>"; the /events
+Server-Sent Events endpoint subscribes to the topics a browser tab is watching, so
+progress is pushed to clients instead of being polled from the data files.
+"""
+
+import asyncio
+import threading
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+class Subscription:
+    """A set of topics delivered to an asyncio queue on the subscriber's event loop."""
+
+    def __init__(self, bus: "EventBus", topics: Iterable[str], loop: asyncio.AbstractEventLoop):
+        self.topics = set(topics)
+        self.queue: "asyncio.Queue[Tuple[str, Dict]]" = asyncio.Queue()
+        self._bus = bus
+        self._loop = loop
+
+    def deliver(self, topic: str, data: Dict):
+        """Queue an event from any thread."""
+        try:
+            self._loop.call_soon_threadsafe(self.queue.put_nowait, (topic, data))
+        except RuntimeError:
+            # The subscriber's loop has already shut down
+            pass
+
+    async def get(self, timeout: float = None) -> Optional[Tuple[str, Dict]]:
+        """Wait for the next (topic, data) event, or return None after timeout seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self._bus.unsubscribe(self)
+
+
+class EventBus:
+    """Thread-safe publish/subscribe hub; publishers may run on any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        """Subscribe the running event loop to the given topics."""
+        subscription = Subscription(self, topics, asyncio.get_running_loop())
+        with self._lock:
+            for topic in subscription.topics:
+                self._subscriptions.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            for topic in subscription.topics:
+                subscribers = self._subscriptions.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscriptions[topic]
+
+    def publish(self, topic: str, data: Dict):
+        """Deliver an event to every current subscriber of a topic."""
+        with self._lock:
+            subscribers = list(self._subscriptions.get(topic, ()))
+        for subscription in subscribers:
+            subscription.deliver(topic, data)
+
+
+# Shared by background jobs and the /events endpoint
+event_bus = EventBus()
@@ -20,6 +20,7 @@ import {
   Box,
   IconButton,
   HStack,
+  Checkbox,
 } from '@chakra-ui/react';
 import { FaPlus, FaSave, FaTrash } from 'react-icons/fa';
 import { api } from '../utils/api.js';
@@ -42,6 +43,7 @@ const ReportModal = ({ isOpen, onClose, transcript }) => {
   const [selectedPrompt, setSelectedPrompt] = useState('');
   const [isGenerating, setIsGenerating] = useState(false);
   const [showNewPrompt, setShowNewPrompt] = useState(false);
+  const [regenerate, setRegenerate] = useState(false);
   const toast = useToast();
 
   useEffect(() => {
@@ -123,7 +125,8 @@ const ReportModal = ({ isOpen, onClose, transcript }) => {
       const { report_id } = await api.generateReport(
         transcript.id,
         selectedPrompt || prompt,
-        title
+        title,
+        !regenerate
       );
 
       toast({
@@ -154,6 +157,7 @@ const ReportModal = ({ isOpen, onClose, transcript }) => {
     setPrompt('');
     setSelectedPrompt('');
     setShowNewPrompt(false);
+    setRegenerate(false);
     setIsGenerating(false);
     onClose();
   };
@@ -249,6 +253,15 @@ const ReportModal = ({ isOpen, onClose, transcript }) => {
               </Box>
             )}
 
+            <Checkbox
+              alignSelf="flex-start"
+              isChecked={regenerate}
+              onChange={(e) => setRegenerate(e.target.checked)}
+              isDisabled={isGenerating}
+            >
+              Jana semula (jangan guna hasil laporan yang sama sebelum ini)
+            </Checkbox>
+
           </VStack>
         </ModalBody>
 
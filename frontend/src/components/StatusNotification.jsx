@@ -16,7 +16,7 @@ import {
   Flex,
 } from '@chakra-ui/react';
 import { FaClock, FaExclamationTriangle, FaSpinner } from 'react-icons/fa';
-import { api } from '../utils/api';
+import { watchStatus } from '../utils/statusEvents';
 
 const slideIn = keyframes`
   from {
@@ -48,78 +48,83 @@ const StatusNotification = () => {
   const messageColor = useColorModeValue('gray.500', 'gray.400');
 
   useEffect(() => {
-    const checkTranscriptionStatus = async () => {
+    // Latest pushed status per watched transcript, and the matching unsubscribe functions
+    const statuses = {};
+    const subscriptions = {};
+
+    const showNotifications = () => {
       const transcripts = JSON.parse(localStorage.getItem('transcripts') || '[]');
-      const processingTranscripts = transcripts.filter(t =>
-        t.status === 'processing' || t.status === 'pending'
+      setNotifications(
+        Object.entries(statuses)
+          .filter(([, status]) => status.status !== 'completed')
+          .map(([id, status]) => ({
+            id,
+            title: transcripts.find(t => t.id === id)?.title,
+            progress: status.progress || 0,
+            status: status.status,
+            message: status.message
+          }))
       );
+    };
 
-      if (processingTranscripts.length > 0) {
-        try {
-          const updatedNotifications = [];
-          const updatedTranscripts = [...transcripts];
-          let hasUpdates = false;
-
-          for (const transcript of processingTranscripts) {
-            try {
-              const status = await api.getTranscriptionStatus(transcript.id);
-              
-              // Update transcript status in local array
-              const transcriptIndex = updatedTranscripts.findIndex(t => t.id === transcript.id);
-              if (transcriptIndex !== -1) {
-                if (status.status !== updatedTranscripts[transcriptIndex].status ||
-                    status.progress !== updatedTranscripts[transcriptIndex].progress) {
-                  updatedTranscripts[transcriptIndex] = {
-                    ...updatedTranscripts[transcriptIndex],
-                    status: status.status,
-                    progress: status.progress
-                  };
-                  hasUpdates = true;
-                }
-              }
-
-              if (status.status !== 'completed') {
-                updatedNotifications.push({
-                  id: transcript.id,
-                  title: transcript.title,
-                  progress: status.progress || 0,
-                  status: status.status,
-                  message: status.message
-                });
-              } else if (status.status === 'completed' && !transcript.notifiedCompletion) {
-                // Show completion notification
-                const completedTranscript = updatedTranscripts[transcriptIndex];
-                completedTranscript.notifiedCompletion = true;
-                hasUpdates = true;
-              }
-            } catch (error) {
-              console.error('Error checking transcript status:', error);
-              updatedNotifications.push({
-                id: transcript.id,
-                title: transcript.title,
-                progress: 0,
-                status: 'error',
-                message: 'Ralat semasa menyemak status'
-              });
-            }
-          }
+    const stopWatching = (id) => {
+      if (subscriptions[id]) {
+        subscriptions[id]();
+        delete subscriptions[id];
+      }
+    };
 
-          // Update localStorage if there were changes
-          if (hasUpdates) {
-            localStorage.setItem('transcripts', JSON.stringify(updatedTranscripts));
-          }
+    const handleStatus = (id, status) => {
+      if (status.status === 'not_found') {
+        stopWatching(id);
+        delete statuses[id];
+        showNotifications();
+        return;
+      }
 
-          setNotifications(updatedNotifications);
-        } catch (error) {
-          console.error('Error checking transcription status:', error);
+      // Update transcript status in localStorage
+      const transcripts = JSON.parse(localStorage.getItem('transcripts') || '[]');
+      const transcriptIndex = transcripts.findIndex(t => t.id === id);
+      if (transcriptIndex !== -1) {
+        transcripts[transcriptIndex] = {
+          ...transcripts[transcriptIndex],
+          status: status.status,
+          progress: status.progress
+        };
+        if (status.status === 'completed') {
+          transcripts[transcriptIndex].notifiedCompletion = true;
         }
+        localStorage.setItem('transcripts', JSON.stringify(transcripts));
+      }
+
+      if (status.status === 'completed') {
+        stopWatching(id);
+        delete statuses[id];
       } else {
-        setNotifications([]);
+        statuses[id] = status;
+        if (status.status === 'error') {
+          stopWatching(id);
+        }
       }
+      showNotifications();
     };
 
-    const interval = setInterval(checkTranscriptionStatus, 1000); // Check every second
-    return () => clearInterval(interval);
+    // Reading localStorage is cheap; only newly started transcripts open a subscription
+    const watchNewTranscripts = () => {
+      const transcripts = JSON.parse(localStorage.getItem('transcripts') || '[]');
+      transcripts
+        .filter(t => (t.status === 'processing' || t.status === 'pending') && !subscriptions[t.id])
+        .forEach(t => {
+          subscriptions[t.id] = watchStatus('job', t.id, (status) => handleStatus(t.id, status));
+        });
+    };
+
+    watchNewTranscripts();
+    const interval = setInterval(watchNewTranscripts, 1000);
+    return () => {
+      clearInterval(interval);
+      Object.keys(subscriptions).forEach(stopWatching);
+    };
   }, []);
 
   const removeNotification = (id) => {
@@ -15,6 +15,7 @@ import {
 } from '@chakra-ui/react';
 import ReportTable from '../components/ReportTable.jsx';
 import { api } from '../utils/api.js';
+import { watchStatus } from '../utils/statusEvents';
 
 const ManageReports = () => {
   const [reports, setReports] = useState([]);
@@ -22,14 +23,14 @@ const ManageReports = () => {
   const { isOpen: isDeleteOpen, onOpen: onDeleteOpen, onClose: onDeleteClose } = useDisclosure();
   const toast = useToast();
   const cancelRef = useRef();
-  const pollingIntervalsRef = useRef({});
+  const subscriptionsRef = useRef({});
 
   useEffect(() => {
     loadReports();
     return () => {
-      // Clean up polling intervals on unmount
-      Object.values(pollingIntervalsRef.current).forEach(interval => {
-        clearInterval(interval);
+      // Stop watching status updates on unmount
+      Object.values(subscriptionsRef.current).forEach(unsubscribe => {
+        unsubscribe();
       });
     };
   }, []);
@@ -39,10 +40,10 @@ const ManageReports = () => {
       const reportsList = await api.listReports();
       setReports(reportsList);
 
-      // Start polling for any processing reports
+      // Watch status updates for any processing reports
       reportsList.forEach(report => {
         if (report.status === 'processing' || report.status === 'pending') {
-          startPolling(report.id);
+          startWatching(report.id);
         }
       });
     } catch (error) {
@@ -57,41 +58,42 @@ const ManageReports = () => {
     }
   };
 
-  const startPolling = (reportId) => {
-    // Clear existing polling if any
-    if (pollingIntervalsRef.current[reportId]) {
-      clearInterval(pollingIntervalsRef.current[reportId]);
-      delete pollingIntervalsRef.current[reportId];
+  const stopWatching = (reportId) => {
+    if (subscriptionsRef.current[reportId]) {
+      subscriptionsRef.current[reportId]();
+      delete subscriptionsRef.current[reportId];
     }
+  };
+
+  const startWatching = (reportId) => {
+    // Clear existing subscription if any
+    stopWatching(reportId);
+
+    // Status changes are pushed by the server as they happen
+    subscriptionsRef.current[reportId] = watchStatus('report', reportId, (status) => {
+      if (status.status === 'not_found') {
+        stopWatching(reportId);
+        return;
+      }
 
-    // Start new polling
-    pollingIntervalsRef.current[reportId] = setInterval(async () => {
-      try {
-        const status = await api.getReportProgress(reportId);
-        updateReportStatus(reportId, status);
-
-        // Stop polling if completed or error
-        if (status.status === 'completed' || status.status === 'error') {
-          clearInterval(pollingIntervalsRef.current[reportId]);
-          delete pollingIntervalsRef.current[reportId];
-
-          // Show completion notification
-          if (status.status === 'completed') {
-            toast({
-              title: 'Laporan Selesai',
-              description: 'Laporan telah selesai dijana',
-              status: 'success',
-              duration: 5000,
-              isClosable: true,
-            });
-          }
+      updateReportStatus(reportId, status);
+
+      // Stop watching if completed or error
+      if (status.status === 'completed' || status.status === 'error') {
+        stopWatching(reportId);
+
+        // Show completion notification
+        if (status.status === 'completed') {
+          toast({
+            title: 'Laporan Selesai',
+            description: 'Laporan telah selesai dijana',
+            status: 'success',
+            duration: 5000,
+            isClosable: true,
+          });
         }
-      } catch (error) {
-        console.error('Error checking report status:', error);
-        clearInterval(pollingIntervalsRef.current[reportId]);
-        delete pollingIntervalsRef.current[reportId];
       }
-    }, 1000);
+    });
   };
 
   const updateReportStatus = (reportId, status) => {
@@ -23,6 +23,7 @@ import {
 import TranscriptTable from '../components/TranscriptTable';
 import ReportModal from '../components/ReportModal';
 import { api } from '../utils/api';
+import { watchStatus } from '../utils/statusEvents';
 
 const ManageTranscript = () => {
   const [transcripts, setTranscripts] = useState([]);
@@ -33,15 +34,15 @@ const ManageTranscript = () => {
   const { isOpen: isEditOpen, onOpen: onEditOpen, onClose: onEditClose } = useDisclosure();
   const { isOpen: isDeleteOpen, onOpen: onDeleteOpen, onClose: onDeleteClose } = useDisclosure();
   const toast = useToast();
-  const pollingRef = useRef({});
+  const subscriptionsRef = useRef({});
   const cancelRef = useRef();
 
   useEffect(() => {
     loadTranscripts();
     return () => {
-      // Clean up polling intervals on unmount
-      Object.values(pollingRef.current).forEach(interval => {
-        clearInterval(interval);
+      // Stop watching status updates on unmount
+      Object.values(subscriptionsRef.current).forEach(unsubscribe => {
+        unsubscribe();
       });
     };
   }, []);
@@ -62,10 +63,10 @@ const ManageTranscript = () => {
       
       setTranscripts(mappedTranscripts);
       
-      // Start polling for any processing transcripts
+      // Watch status updates for any processing transcripts
       mappedTranscripts.forEach(transcript => {
         if (transcript.status === 'processing' || transcript.status === 'pending') {
-          startPolling(transcript.id);
+          startWatching(transcript.id);
         }
       });
     } catch (error) {
@@ -80,58 +81,52 @@ const ManageTranscript = () => {
     }
   };
 
-  const startPolling = (transcriptId) => {
-    // Clear existing polling if any
-    if (pollingRef.current[transcriptId]) {
-      clearInterval(pollingRef.current[transcriptId]);
-      delete pollingRef.current[transcriptId];
+  const stopWatching = (transcriptId) => {
+    if (subscriptionsRef.current[transcriptId]) {
+      subscriptionsRef.current[transcriptId]();
+      delete subscriptionsRef.current[transcriptId];
     }
+  };
+
+  const startWatching = (transcriptId) => {
+    // Clear existing subscription if any
+    stopWatching(transcriptId);
+
+    // Status changes are pushed by the server as they happen
+    subscriptionsRef.current[transcriptId] = watchStatus('job', transcriptId, async (status) => {
+      // Job no longer known to the server (e.g. data was reset)
+      if (status.status === 'not_found') {
+        stopWatching(transcriptId);
+        updateTranscriptStatus(transcriptId, { status: 'completed', progress: 100 });
+        return;
+      }
 
-    // Start new polling
-    pollingRef.current[transcriptId] = setInterval(async () => {
-      try {
-        const status = await api.getTranscriptionStatus(transcriptId);
-        updateTranscriptStatus(transcriptId, status);
-
-        // Stop polling if completed or error
-        if (status.status === 'completed' || status.status === 'error') {
-          clearInterval(pollingRef.current[transcriptId]);
-          delete pollingRef.current[transcriptId];
-
-          // Show completion notification
-          if (status.status === 'completed') {
-            toast({
-              title: 'Transkrip Selesai',
-              description: `Transkrip telah selesai diproses`,
-              status: 'success',
-              duration: 5000,
-              isClosable: true,
-            });
-
-            // Try to get the transcript text
-            try {
-              const transcript = await api.getTranscript(transcriptId);
-              updateTranscriptText(transcriptId, transcript.text);
-            } catch (error) {
-              console.error('Error fetching transcript text:', error);
-            }
+      updateTranscriptStatus(transcriptId, status);
+
+      // Stop watching if completed or error
+      if (status.status === 'completed' || status.status === 'error') {
+        stopWatching(transcriptId);
+
+        // Show completion notification
+        if (status.status === 'completed') {
+          toast({
+            title: 'Transkrip Selesai',
+            description: `Transkrip telah selesai diproses`,
+            status: 'success',
+            duration: 5000,
+            isClosable: true,
+          });
+
+          // Try to get the transcript text
+          try {
+            const transcript = await api.getTranscript(transcriptId);
+            updateTranscriptText(transcriptId, transcript.text);
+          } catch (error) {
+            console.error('Error fetching transcript text:', error);
           }
         }
-      } catch (error) {
-        console.error('Error checking transcript status:', error);
-        // Stop polling on error
-        clearInterval(pollingRef.current[transcriptId]);
-        delete pollingRef.current[transcriptId];
-
-        // Update transcript status to completed if 404 (server restarted)
-        if (error.message.includes('404')) {
-          updateTranscriptStatus(transcriptId, { status: 'completed', progress: 100 });
-        } else {
-          // Otherwise mark as error
-          updateTranscriptStatus(transcriptId, { status: 'error', progress: 0 });
-        }
       }
-    }, 1000);
+    });
   };
 
   const updateTranscriptStatus = (transcriptId, status) => {
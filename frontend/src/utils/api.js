@@ -133,14 +133,15 @@ export const api = {
     return true;
   },
 
-  async generateReport(transcriptId, prompt, title) {
+  async generateReport(transcriptId, prompt, title, useCache = true) {
     const response = await fetch(`${BASE_URL}/generate-report`, {
       method: 'POST',
       headers: getHeaders(),
       body: JSON.stringify({
         transcript_id: transcriptId,
         prompt: prompt,
-        title: title
+        title: title,
+        use_cache: useCache
       })
     });
 
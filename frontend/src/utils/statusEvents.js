@@ -0,0 +1,70 @@
+// Job and report status updates pushed by the server over Server-Sent Events.
+// All watchers in a tab share one EventSource, which is reopened whenever the set of
+// watched items changes, so the number of connections does not grow with the number of jobs.
+const BASE_URL = '/api';
+
+const watchers = {
+  job: new Map(),
+  report: new Map(),
+};
+
+let source = null;
+let reconnectScheduled = false;
+
+const reconnect = () => {
+  reconnectScheduled = false;
+
+  if (source) {
+    source.close();
+    source = null;
+  }
+
+  const jobs = [...watchers.job.keys()];
+  const reports = [...watchers.report.keys()];
+  if (jobs.length === 0 && reports.length === 0) {
+    return;
+  }
+
+  const params = new URLSearchParams();
+  if (jobs.length > 0) params.set('jobs', jobs.join(','));
+  if (reports.length > 0) params.set('reports', reports.join(','));
+
+  source = new EventSource(`${BASE_URL}/events?${params.toString()}`);
+  Object.keys(watchers).forEach((kind) => {
+    source.addEventListener(kind, (event) => {
+      const status = JSON.parse(event.data);
+      const callbacks = watchers[kind].get(status.id);
+      if (callbacks) {
+        [...callbacks].forEach((callback) => callback(status));
+      }
+    });
+  });
+};
+
+const scheduleReconnect = () => {
+  // Batch changes made in the same tick into a single reconnect
+  if (!reconnectScheduled) {
+    reconnectScheduled = true;
+    queueMicrotask(reconnect);
+  }
+};
+
+// Call `callback` with every status update of a job or report ('job' | 'report').
+// The current status is delivered first. Returns a function that stops watching.
+export const watchStatus = (kind, id, callback) => {
+  if (!watchers[kind].has(id)) {
+    watchers[kind].set(id, new Set());
+    scheduleReconnect();
+  }
+  watchers[kind].get(id).add(callback);
+
+  return () => {
+    const callbacks = watchers[kind].get(id);
+    if (!callbacks) return;
+    callbacks.delete(callback);
+    if (callbacks.size === 0) {
+      watchers[kind].delete(id);
+      scheduleReconnect();
+    }
+  };
+};
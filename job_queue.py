@@ -0,0 +1,373 @@
+"""
+Durable queue for transcription and report jobs.
+
+Jobs are queued and run by a fixed pool of asyncio workers, so throughput is
+bounded by the number of workers rather than by how many requests arrive. A worker
+holds a lease on the job it runs and renews it with heartbeats. If the process
+dies, the lease runs out and the job is claimed again, by this process after a
+restart or by another worker.
+
+Two backends share the same interface (enqueue, claim, heartbeat, complete, fail
+and release):
+
+- SQLiteJobQueue: jobs in an SQLite table, shared by the API server and worker
+  processes on the same host. SQLite's WAL mode, and so lease claiming, is not
+  safe on a network filesystem.
+- HTTPJobQueue: used by worker nodes on other hosts, which lease jobs from the API
+  server's SQLite queue through its /internal/queue endpoints.
+
+Jobs can be queued in a group (e.g. the reports of one batch request). At most
+group_limit jobs of a group are leased at a time, so a large group cannot take
+every worker while other jobs wait behind it.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterator, Optional, Tuple, Union
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Seconds a claimed job stays leased without a heartbeat
+QUEUE_LEASE_SECONDS = float(os.environ.get("QUEUE_LEASE_SECONDS", "60"))
+
+# Claims of one job before it is given up (each interrupted run counts)
+QUEUE_MAX_ATTEMPTS = int(os.environ.get("QUEUE_MAX_ATTEMPTS", "3"))
+
+# Seconds an idle worker waits before checking the queue again
+QUEUE_POLL_INTERVAL = 2.0
+
+# Seconds a worker node waits for the API server before a queue request fails
+QUEUE_HTTP_TIMEOUT = 30.0
+
+
+class QueueError(Exception):
+    """Raised when a worker node cannot reach the queue on the API server."""
+
+
+class SQLiteJobQueue:
+    """Jobs queued in SQLite, claimed by workers under renewable leases."""
+
+    def __init__(self, path: Path, lease_seconds: float = QUEUE_LEASE_SECONDS, group_limit: int = 1):
+        """
+        Args:
+            path: SQLite file of the queue
+            lease_seconds: Seconds a claimed job stays leased without a heartbeat
+            group_limit: Jobs of one group leased at a time, across all processes
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.group_limit = max(1, group_limit)
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS queue ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, worker TEXT, lease_expires REAL, "
+            "enqueued_at REAL NOT NULL, error TEXT, job_group TEXT)"
+        )
+        # Queues created before jobs had groups
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(queue)")}
+        if "job_group" not in columns:
+            conn.execute("ALTER TABLE queue ADD COLUMN job_group TEXT")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS queue_claim ON queue (kind, status, enqueued_at)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS queue_group ON queue (job_group, status)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def enqueue(self, kind: str, job_id: str, group: Optional[str] = None):
+        """Queue a job; the job's data stays in the record store under the same ID."""
+        self._connection().execute(
+            "INSERT INTO queue (id, kind, status, enqueued_at, job_group) VALUES (?, ?, 'queued', ?, ?) "
+            "ON CONFLICT(id) DO NOTHING",
+            (job_id, kind, time.time(), group),
+        )
+
+    def claim(self, kind: str, worker: str) -> Optional[Tuple[str, int]]:
+        """
+        Lease the oldest runnable job of a kind.
+
+        Jobs whose previous lease has expired are runnable again. Jobs of a group
+        that already holds group_limit live leases are skipped, so the oldest job
+        of another group, or without one, runs first.
+
+        Returns:
+            (job_id, attempt number), or None if nothing is waiting
+        """
+        now = time.time()
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT id, attempts FROM queue WHERE kind = ? AND "
+                "(status = 'queued' OR (status = 'running' AND lease_expires < ?)) AND "
+                "(job_group IS NULL OR (SELECT COUNT(*) FROM queue AS leased WHERE "
+                "leased.job_group = queue.job_group AND leased.status = 'running' AND leased.lease_expires >= ?) < ?) "
+                "ORDER BY enqueued_at LIMIT 1",
+                (kind, now, now, self.group_limit),
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, attempts = row
+            conn.execute(
+                "UPDATE queue SET status = 'running', attempts = ?, worker = ?, lease_expires = ? WHERE id = ?",
+                (attempts + 1, worker, now + self.lease_seconds, job_id),
+            )
+        return job_id, attempts + 1
+
+    def heartbeat(self, job_id: str, worker: str) -> bool:
+        """Renew a lease. Returns False if the worker no longer holds it."""
+        cursor = self._connection().execute(
+            "UPDATE queue SET lease_expires = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (time.time() + self.lease_seconds, job_id, worker),
+        )
+        return cursor.rowcount > 0
+
+    def complete(self, job_id: str, worker: str):
+        """Mark a leased job as done."""
+        self._connection().execute(
+            "UPDATE queue SET status = 'done', lease_expires = NULL WHERE id = ? AND worker = ?",
+            (job_id, worker),
+        )
+
+    def fail(self, job_id: str, worker: str, error: str):
+        """Mark a leased job as failed for good."""
+        self._connection().execute(
+            "UPDATE queue SET status = 'failed', lease_expires = NULL, error = ? WHERE id = ? AND worker = ?",
+            (error, job_id, worker),
+        )
+
+    def release(self, job_id: str, worker: str):
+        """Give a leased job back to the queue without counting the attempt."""
+        self._connection().execute(
+            "UPDATE queue SET status = 'queued', attempts = attempts - 1, worker = NULL, lease_expires = NULL "
+            "WHERE id = ? AND worker = ? AND status = 'running'",
+            (job_id, worker),
+        )
+
+    def contains(self, job_id: str) -> bool:
+        """Return whether a job has ever been queued."""
+        return self._connection().execute("SELECT 1 FROM queue WHERE id = ?", (job_id,)).fetchone() is not None
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return job counts per kind and status."""
+        counts: Dict[str, Dict[str, int]] = {}
+        for kind, status, count in self._connection().execute(
+            "SELECT kind, status, COUNT(*) FROM queue GROUP BY kind, status"
+        ):
+            counts.setdefault(kind, {})[status] = count
+        return counts
+
+
+class HTTPJobQueue:
+    """The API server's job queue, reached by a worker node on another host."""
+
+    def __init__(self, api_url: str, token: str):
+        """
+        Args:
+            api_url: Base URL of the API server
+            token: WORKER_TOKEN shared with the API server
+        """
+        # Replaced by the API server's setting with every claim
+        self.lease_seconds = QUEUE_LEASE_SECONDS
+        # Retries cover connections refused while the API server restarts
+        self._client = httpx.Client(
+            base_url=api_url.rstrip("/"),
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=QUEUE_HTTP_TIMEOUT,
+            transport=httpx.HTTPTransport(retries=3),
+        )
+
+    def _post(self, path: str, payload: Dict):
+        try:
+            response = self._client.post(f"/internal/queue/{path}", json=payload)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise QueueError(f"Queue request {path} failed: {str(e)}") from e
+        return response.json()
+
+    def enqueue(self, kind: str, job_id: str, group: Optional[str] = None):
+        """Queue a job; the job's data stays in the record store under the same ID."""
+        self._post(f"{kind}/jobs", {"job_id": job_id, "group": group})
+
+    def claim(self, kind: str, worker: str) -> Optional[Tuple[str, int]]:
+        """
+        Lease the oldest runnable job of a kind.
+
+        Returns:
+            (job_id, attempt number), or None if nothing is waiting
+        """
+        lease = self._post(f"{kind}/claim", {"worker": worker})
+        if lease is None:
+            return None
+        self.lease_seconds = lease["lease_seconds"]
+        return lease["job_id"], lease["attempt"]
+
+    def heartbeat(self, job_id: str, worker: str) -> bool:
+        """Renew a lease. Returns False if the worker no longer holds it."""
+        return self._post(f"jobs/{job_id}/heartbeat", {"worker": worker})["held"]
+
+    def complete(self, job_id: str, worker: str):
+        """Mark a leased job as done."""
+        self._post(f"jobs/{job_id}/complete", {"worker": worker})
+
+    def fail(self, job_id: str, worker: str, error: str):
+        """Mark a leased job as failed for good."""
+        self._post(f"jobs/{job_id}/fail", {"worker": worker, "error": error})
+
+    def release(self, job_id: str, worker: str):
+        """Give a leased job back to the queue without counting the attempt."""
+        self._post(f"jobs/{job_id}/release", {"worker": worker})
+
+
+class WorkerPool:
+    """
+    Fixed number of asyncio workers per job kind, running jobs from a job queue.
+
+    Queue calls run in threads, so neither a busy database nor a slow API server
+    (HTTPJobQueue) blocks the jobs running on the event loop.
+    """
+
+    def __init__(
+        self,
+        job_queue: Union[SQLiteJobQueue, HTTPJobQueue],
+        handlers: Dict[str, Callable[[str], Awaitable]],
+        workers: Dict[str, int],
+        on_give_up: Dict[str, Callable[[str, int], None]] = None,
+        max_attempts: int = QUEUE_MAX_ATTEMPTS,
+    ):
+        """
+        Args:
+            job_queue: Queue to take jobs from
+            handlers: Coroutine function per job kind, called with the job ID
+            workers: Number of workers per job kind
+            on_give_up: Called per job kind with (job_id, attempts) when a job has been
+                interrupted too often, to mark its record as failed
+            max_attempts: Claims of one job before it is given up
+        """
+        self.job_queue = job_queue
+        self.handlers = handlers
+        self.workers = workers
+        self.on_give_up = on_give_up or {}
+        self.max_attempts = max_attempts
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self._tasks = []
+        # Unique per process so leases of a crashed run are never mistaken for ours
+        self._prefix = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    def start(self):
+        """Start the workers on the running event loop."""
+        for kind, count in self.workers.items():
+            self._wakeups[kind] = asyncio.Event()
+            for n in range(count):
+                self._tasks.append(asyncio.create_task(self._run(kind, f"{self._prefix}-{kind}-{n}")))
+        logger.info(f"Started job workers: {self.workers}")
+
+    async def stop(self):
+        """Stop the workers, handing their running jobs back to the queue."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, kind: str, job_id: str, group: Optional[str] = None):
+        """Queue a job, in a group if given, and wake an idle worker."""
+        self.job_queue.enqueue(kind, job_id, group)
+        wakeup = self._wakeups.get(kind)
+        if wakeup is not None:
+            wakeup.set()
+
+    async def _run(self, kind: str, worker: str):
+        wakeup = self._wakeups[kind]
+        while True:
+            try:
+                claimed = await asyncio.to_thread(self.job_queue.claim, kind, worker)
+            except (sqlite3.Error, QueueError) as e:
+                logger.error(f"Error claiming {kind} job: {str(e)}")
+                claimed = None
+            if claimed is None:
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), QUEUE_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job_id, attempt = claimed
+            if attempt > self.max_attempts:
+                logger.error(f"Giving up {kind} job {job_id} after {attempt - 1} interrupted attempt(s)")
+                await self._settle(self.job_queue.fail, job_id, worker, "Too many interrupted attempts")
+                if kind in self.on_give_up:
+                    self.on_give_up[kind](job_id, attempt - 1)
+                continue
+            if attempt > 1:
+                logger.info(f"Resuming {kind} job {job_id} (attempt {attempt})")
+            await self._execute(kind, job_id, worker)
+
+    async def _execute(self, kind: str, job_id: str, worker: str):
+        job = asyncio.create_task(self.handlers[kind](job_id))
+        heartbeat = asyncio.create_task(self._heartbeat(job, job_id, worker))
+        try:
+            # Shielded so stopping the worker can be told apart from losing the lease
+            await asyncio.shield(job)
+        except asyncio.CancelledError:
+            if not job.done():
+                # The worker itself is stopping: let the job run again on the next start
+                job.cancel()
+                await self._settle(self.job_queue.release, job_id, worker)
+                raise
+            logger.warning(f"Lost the lease on {kind} job {job_id}")
+        except Exception as e:
+            logger.error(f"Error running {kind} job {job_id}: {str(e)}")
+            await self._settle(self.job_queue.fail, job_id, worker, str(e))
+        else:
+            await self._settle(self.job_queue.complete, job_id, worker)
+        finally:
+            heartbeat.cancel()
+
+    async def _settle(self, action: Callable, job_id: str, *args):
+        """Report a job's outcome to the queue; if that fails, its lease runs out and it runs again."""
+        try:
+            await asyncio.to_thread(action, job_id, *args)
+        except (sqlite3.Error, QueueError) as e:
+            logger.error(f"Error updating job {job_id} in the queue: {str(e)}")
+
+    async def _heartbeat(self, job: asyncio.Task, job_id: str, worker: str):
+        while True:
+            await asyncio.sleep(self.job_queue.lease_seconds / 4)
+            try:
+                if not await asyncio.to_thread(self.job_queue.heartbeat, job_id, worker):
+                    # Another worker has taken the job over
+                    job.cancel()
+                    return
+            except (sqlite3.Error, QueueError) as e:
+                logger.error(f"Error renewing lease on job {job_id}: {str(e)}")
@@ -0,0 +1,36 @@
+"""
+On-disk cache of text model responses.
+
+Reports are often regenerated from the same transcript with the same prompt
+template, and long transcripts are summarised into the same notes whatever the
+report's format. Responses are keyed by a hash of the whole request (messages,
+model, temperature and token limit), so an identical request is answered without
+calling the text model. The cache is an SQLite file shared by every process using
+the same path; the least recently used responses are evicted once it holds more
+than LLM_CACHE_MAX_ENTRIES.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List
+
+from sqlite_cache import SQLiteLRUCache
+
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", os.path.join(os.environ.get("DATA_DIR", "data"), "llm_cache.db"))
+
+# Maximum number of cached responses; 0 disables the cache
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+
+def response_cache_key(messages: List[Dict], model: str, temperature: float, max_tokens: int) -> str:
+    """Return the cache key of a chat completion request."""
+    request = json.dumps(
+        {"messages": messages, "model": model, "temperature": temperature, "max_tokens": max_tokens},
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(request.encode()).hexdigest()
+
+
+# Shared by every report job in the process
+response_cache = SQLiteLRUCache(LLM_CACHE_PATH, LLM_CACHE_MAX_ENTRIES, "text model response")
@@ -0,0 +1,168 @@
+"""
+Size-bounded LRU cache of strings in an SQLite file.
+
+Used for the per-segment STT cache (stt_cache.py), the text model response cache
+(llm_cache.py) and the cache of whole transcripts (transcript_cache.py). The file can be shared by every process on the host; the
+least recently used entries are evicted once it holds more than max_entries.
+
+Lookups are read-only: the entries they hit are remembered in memory and their
+last-used times written together with the next put. Callers on an event loop use
+aget and aput, which run on the cache's own thread so a busy database never
+blocks the loop, its request handlers or job lease heartbeats.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for another process's write lock; the cache is skipped after that
+CACHE_BUSY_TIMEOUT = 5.0
+
+# Writes between checks of the cache size
+_EVICTION_CHECK_INTERVAL = 100
+
+# Hits whose last-used time is written without waiting for the next put
+_MAX_PENDING_TOUCHES = 256
+
+
+class SQLiteLRUCache:
+    """LRU cache of string values in an SQLite file, safe to share between threads."""
+
+    def __init__(self, path: str, max_entries: int, label: str):
+        """
+        Args:
+            path: SQLite file of the cache
+            max_entries: Maximum number of entries; 0 disables the cache
+            label: What is cached, for log messages
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.label = label
+        # Connections are opened on first use, so creating a cache touches no files
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._touched: Dict[str, float] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=CACHE_BUSY_TIMEOUT, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached value, or None (blocking)."""
+        if not self.enabled:
+            return None
+        try:
+            row = self._connection().execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            # The cache only saves work; never fail a job because of it
+            logger.warning(f"Error reading {self.label} cache: {str(e)}")
+            return None
+        if row is None:
+            return None
+        with self._lock:
+            self._touched[key] = time.time()
+            flush = len(self._touched) >= _MAX_PENDING_TOUCHES
+        if flush:
+            try:
+                self._flush_touches()
+            except sqlite3.Error as e:
+                logger.warning(f"Error writing {self.label} cache: {str(e)}")
+        return row[0]
+
+    def put(self, key: str, value: str):
+        """Cache a value, evicting the least recently used entries when full (blocking)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._writes += 1
+            check = self._writes % _EVICTION_CHECK_INTERVAL == 1
+        try:
+            self._connection().execute(
+                "INSERT INTO entries (key, value, last_used) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, last_used = excluded.last_used",
+                (key, value, time.time()),
+            )
+            self._flush_touches()
+            if check:
+                self.evict()
+        except sqlite3.Error as e:
+            logger.warning(f"Error writing {self.label} cache: {str(e)}")
+
+    def delete(self, key: str):
+        """Remove an entry, e.g. when the data it was made from is deleted (blocking)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._touched.pop(key, None)
+        try:
+            self._connection().execute("DELETE FROM entries WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            logger.warning(f"Error writing {self.label} cache: {str(e)}")
+
+    def _flush_touches(self):
+        """Write the last-used times of entries hit since the last flush."""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            self._connection().executemany(
+                "UPDATE entries SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in touched.items()],
+            )
+
+    def evict(self):
+        """Delete the least recently used entries beyond max_entries."""
+        conn = self._connection()
+        excess = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+
+    def _run(self, func, *args):
+        with self._lock:
+            if self._executor is None:
+                # A dedicated thread: cache I/O never queues behind other to_thread work
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"cache-{self.path.stem}")
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def aget(self, key: str) -> Optional[str]:
+        """Return a cached value, or None, without blocking the event loop."""
+        if not self.enabled:
+            return None
+        return await self._run(self.get, key)
+
+    async def aput(self, key: str, value: str):
+        """Cache a value without blocking the event loop."""
+        if not self.enabled:
+            return
+        await self._run(self.put, key, value)
+
+    async def adelete(self, key: str):
+        """Remove an entry without blocking the event loop."""
+        if not self.enabled:
+            return
+        await self._run(self.delete, key)
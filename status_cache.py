@@ -0,0 +1,165 @@
+"""
+In-memory write-through cache for job and report records.
+
+Progress endpoints are polled far more often than jobs change, so status reads are
+served from memory. Records updated through the cache, i.e. by the process running
+the job, are kept until the job finishes. Status changes are written to storage
+immediately; progress-only updates are batched and flushed every few seconds.
+Records this process does not update (e.g. jobs run by another worker process) are
+cached briefly and then re-read.
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+# Seconds a record read from storage is served from memory before being re-read
+STATUS_CACHE_TTL = 2.0
+
+# Seconds a finished record stays cached for final polls before it is evicted
+FINISHED_TTL = 60.0
+
+# Minimum seconds between batched writes of progress-only updates
+FLUSH_INTERVAL = 5.0
+
+
+class _Entry:
+    def __init__(self, record: Dict, expires_at: Optional[float]):
+        self.record = record
+        # None while this process owns the record (it is the latest version)
+        self.expires_at = expires_at
+        # Fields changed in memory but not yet written to storage
+        self.dirty: Dict = {}
+        self.last_flush = time.monotonic()
+
+
+class StatusCache:
+    """Write-through cache of one store table holding job or report records."""
+
+    def __init__(
+        self,
+        store,
+        table: str,
+        finished_statuses: Iterable[str] = ("completed", "error"),
+        ttl: float = STATUS_CACHE_TTL,
+        finished_ttl: float = FINISHED_TTL,
+        flush_interval: float = FLUSH_INTERVAL,
+    ):
+        self.store = store
+        self.table = table
+        self.finished_statuses = set(finished_statuses)
+        self.ttl = ttl
+        self.finished_ttl = finished_ttl
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._next_sweep = time.monotonic() + finished_ttl
+
+    def _cache(self, key: str, record: Dict, now: float) -> _Entry:
+        """Cache a record this process has written. Caller holds the lock."""
+        expires_at = now + self.finished_ttl if record.get("status") in self.finished_statuses else None
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry(record, expires_at)
+        else:
+            entry.record = record
+            entry.expires_at = expires_at
+        return entry
+
+    def _sweep(self, now: float):
+        """Evict expired entries. Caller holds the lock."""
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.finished_ttl
+        for key in [key for key, entry in self._entries.items()
+                    if entry.expires_at is not None and entry.expires_at <= now and not entry.dirty]:
+            del self._entries[key]
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a copy of a record, from memory when possible, or None if it does not exist."""
+        now = time.monotonic()
+        with self._lock:
+            self._sweep(now)
+            entry = self._entries.get(key)
+            if entry is not None and (entry.expires_at is None or now < entry.expires_at):
+                return dict(entry.record)
+
+        record = self.store.get(self.table, key)
+        if record is None:
+            return None
+        with self._lock:
+            # Keep a version written by this process in the meantime
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at is not None:
+                entry = self._entries[key] = _Entry(record, now + self.ttl)
+            return dict(entry.record)
+
+    def is_owned(self, key: str) -> bool:
+        """Return whether this process is running the record's job, so its cached copy is always current."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.expires_at is None
+
+    def put(self, key: str, record: Dict):
+        """Store a new record and cache it until whoever runs the job starts updating it."""
+        now = time.monotonic()
+        with self._lock:
+            self.store.put(self.table, key, record)
+            # The job may be run by a worker in another process, so this copy is not owned
+            self._entries[key] = _Entry(dict(record), now + self.ttl)
+
+    def update(self, key: str, fields: Dict, persist: bool = True) -> Optional[Dict]:
+        """
+        Set some fields of a record.
+
+        Args:
+            key: Record key
+            fields: Fields to set; other fields are left unchanged
+            persist: Write to storage now. Otherwise the change is kept in memory and
+                written with the next flush, at most flush_interval seconds later.
+
+        Returns:
+            A copy of the updated record, or None if it does not exist
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._sweep(now)
+            entry = self._entries.get(key)
+            if not persist and entry is not None and entry.expires_at is None:
+                entry.record.update(fields)
+                entry.dirty.update(fields)
+                if now - entry.last_flush >= self.flush_interval:
+                    self._flush_entry(key, entry, now)
+                return dict(entry.record)
+
+            pending = entry.dirty if entry is not None else {}
+            record = self.store.update(self.table, key, {**pending, **fields})
+            if record is None:
+                self._entries.pop(key, None)
+                return None
+            entry = self._cache(key, record, now)
+            entry.dirty = {}
+            entry.last_flush = now
+            return dict(record)
+
+    def _flush_entry(self, key: str, entry: _Entry, now: float):
+        """Write an entry's pending fields to storage. Caller holds the lock."""
+        if entry.dirty:
+            if self.store.update(self.table, key, entry.dirty) is None:
+                # Deleted from storage behind our back
+                self._entries.pop(key, None)
+            entry.dirty = {}
+        entry.last_flush = now
+
+    def flush(self):
+        """Write all pending in-memory changes to storage."""
+        now = time.monotonic()
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                self._flush_entry(key, entry, now)
+
+    def delete(self, key: str) -> bool:
+        """Delete a record from storage and the cache. Returns whether it existed."""
+        with self._lock:
+            self._entries.pop(key, None)
+            return self.store.delete(self.table, key)
@@ -0,0 +1,466 @@
+"""
+Storage for users, uploads, jobs, transcripts, reports and report batches.
+
+Every table maps a string key to one JSON record. Two backends share the same
+interface, selected with STORAGE_BACKEND on the API server:
+
+- "sqlite" (default): an SQLite database in WAL mode, so reading or changing a
+  record is a single indexed lookup and readers never wait for the writer. Records
+  from the old data/*.json files are imported the first time it is opened.
+- "json": one <table>.json file per table. Each file has its own lock, and writes go
+  to a temporary file that is renamed over the original, so a crash never leaves a
+  truncated file.
+
+Read-modify-write cycles that span several operations use transaction(), which
+holds the table's write lock until the block ends.
+
+Worker nodes on other hosts use HTTPStore instead, which reads and writes the
+records their jobs need (get, put, update and delete) through the API server.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+import aiofiles
+import httpx
+
+logger = logging.getLogger(__name__)
+
+TABLES = ("users", "uploads", "jobs", "transcripts", "reports", "report_batches")
+
+# Record fields looked up by value, indexed per table
+INDEXED_FIELDS = {
+    "users": ("email",),
+    "jobs": ("status",),
+    "reports": ("status", "transcript_id"),
+}
+
+# Fields compared case-insensitively
+NOCASE_FIELDS = {("users", "email")}
+
+# Tables worker nodes on other hosts may read and write through the API server; the
+# API server keeps "transcript_cache" in its transcript cache rather than in the store
+WORKER_TABLES = ("jobs", "transcripts", "reports", "transcript_cache")
+
+# Seconds a worker node waits for the API server before a request fails
+HTTP_STORE_TIMEOUT = 30.0
+
+# Bytes per read when files are sent to or from the API server
+HTTP_FILE_CHUNK_SIZE = 1024 * 1024
+
+
+def _field_expr(table: str, field: str) -> str:
+    expr = f"json_extract(data, '$.{field}')"
+    if (table, field) in NOCASE_FIELDS:
+        expr = f"lower({expr})"
+    return expr
+
+
+class _SQLiteTable:
+    """Dict-like access to one table inside an SQLite write transaction."""
+
+    def __init__(self, conn: sqlite3.Connection, table: str):
+        self._conn = conn
+        self._table = table
+
+    def get(self, key: str, default=None) -> Optional[Dict]:
+        row = self._conn.execute(f"SELECT data FROM {self._table} WHERE id = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def __getitem__(self, key: str) -> Dict:
+        record = self.get(key)
+        if record is None:
+            raise KeyError(key)
+        return record
+
+    def __contains__(self, key: str) -> bool:
+        return self._conn.execute(f"SELECT 1 FROM {self._table} WHERE id = ?", (key,)).fetchone() is not None
+
+    def __setitem__(self, key: str, record: Dict):
+        self._conn.execute(
+            f"INSERT INTO {self._table} (id, data) VALUES (?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET data = excluded.data",
+            (key, json.dumps(record)),
+        )
+
+    def __delitem__(self, key: str):
+        if self._conn.execute(f"DELETE FROM {self._table} WHERE id = ?", (key,)).rowcount == 0:
+            raise KeyError(key)
+
+
+class SQLiteStore:
+    """Keyed JSON records in an SQLite database; safe to share between threads."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection per thread; WAL lets them read while another writes
+        self._local = threading.local()
+        self._create_schema()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        conn = self._connection()
+        for table in TABLES:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+            for field in INDEXED_FIELDS.get(table, ()):
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {table}_{field} ON {table} ({_field_expr(table, field)})"
+                )
+        conn.execute("CREATE TABLE IF NOT EXISTS migrations (name TEXT PRIMARY KEY, applied_at TEXT NOT NULL)")
+
+    @staticmethod
+    def _check_table(table: str):
+        if table not in TABLES:
+            raise ValueError(f"Unknown table: {table}")
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one write transaction, taking the write lock up front."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @contextmanager
+    def transaction(self, table: str) -> Iterator[_SQLiteTable]:
+        """
+        Read-modify-write a table atomically.
+
+        Yields a dict-like view of the table; changed records must be assigned back
+        (records[key] = record). Changes are committed when the block ends, or rolled
+        back if it raises.
+        """
+        self._check_table(table)
+        with self._write() as conn:
+            yield _SQLiteTable(conn, table)
+
+    def get(self, table: str, key: str) -> Optional[Dict]:
+        """Return the record stored under key, or None."""
+        self._check_table(table)
+        row = self._connection().execute(f"SELECT data FROM {table} WHERE id = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, table: str, key: str, record: Dict):
+        """Insert or replace the record stored under key."""
+        self._check_table(table)
+        self._connection().execute(
+            f"INSERT INTO {table} (id, data) VALUES (?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET data = excluded.data",
+            (key, json.dumps(record)),
+        )
+
+    def update(self, table: str, key: str, fields: Dict) -> Optional[Dict]:
+        """
+        Set some fields of a stored record.
+
+        Args:
+            table: Table name
+            key: Record key
+            fields: Fields to set; other fields are left unchanged
+
+        Returns:
+            The updated record, or None if there is no record under key
+        """
+        with self.transaction(table) as records:
+            record = records.get(key)
+            if record is None:
+                return None
+            record.update(fields)
+            records[key] = record
+        return record
+
+    def delete(self, table: str, key: str) -> bool:
+        """Delete the record stored under key. Returns whether it existed."""
+        self._check_table(table)
+        cursor = self._connection().execute(f"DELETE FROM {table} WHERE id = ?", (key,))
+        return cursor.rowcount > 0
+
+    def all(self, table: str) -> Dict[str, Dict]:
+        """Return every record of a table by key, in insertion order."""
+        self._check_table(table)
+        rows = self._connection().execute(f"SELECT id, data FROM {table} ORDER BY rowid")
+        return {key: json.loads(data) for key, data in rows}
+
+    def find(self, table: str, field: str, value) -> Dict[str, Dict]:
+        """Return the records whose field equals value, using the field's index."""
+        self._check_table(table)
+        if field not in INDEXED_FIELDS.get(table, ()):
+            raise ValueError(f"Field {field} of {table} is not indexed")
+        if (table, field) in NOCASE_FIELDS:
+            value = value.lower()
+        rows = self._connection().execute(
+            f"SELECT id, data FROM {table} WHERE {_field_expr(table, field)} = ? ORDER BY rowid", (value,)
+        )
+        return {key: json.loads(data) for key, data in rows}
+
+    def count(self, table: str) -> int:
+        """Return the number of records in a table."""
+        self._check_table(table)
+        return self._connection().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def migrate_json(self, data_dir: Path):
+        """
+        Import records from <table>.json files written by the old file storage.
+
+        Each file is imported once; records already in the database are kept.
+        """
+        for table in TABLES:
+            name = f"import {table}.json"
+            file_path = Path(data_dir) / f"{table}.json"
+            if not file_path.exists():
+                continue
+            with self._write() as conn:
+                if conn.execute("SELECT 1 FROM migrations WHERE name = ?", (name,)).fetchone():
+                    continue
+                try:
+                    with open(file_path, "r") as f:
+                        records = json.load(f)
+                except Exception as e:
+                    logger.error(f"Error importing {file_path}: {str(e)}")
+                    continue
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO {table} (id, data) VALUES (?, ?)",
+                    [(key, json.dumps(record)) for key, record in records.items()],
+                )
+                conn.execute(
+                    "INSERT INTO migrations (name, applied_at) VALUES (?, datetime('now'))", (name,)
+                )
+            logger.info(f"Imported {len(records)} record(s) from {file_path}")
+
+
+class JsonStore:
+    """
+    Keyed JSON records in one <table>.json file per table.
+
+    Every operation holds the table's lock, so concurrent jobs and request handlers
+    in this process never overwrite each other's changes. Files are replaced
+    atomically, which keeps them valid even if the process dies mid-write.
+    """
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self._locks = {table: threading.RLock() for table in TABLES}
+
+    @staticmethod
+    def _check_table(table: str):
+        if table not in TABLES:
+            raise ValueError(f"Unknown table: {table}")
+
+    def _path(self, table: str) -> Path:
+        return self.data_dir / f"{table}.json"
+
+    def _load(self, table: str) -> Dict[str, Dict]:
+        try:
+            with open(self._path(table), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save(self, table: str, records: Dict[str, Dict]):
+        """Write a table to a temporary file, then rename it over the original."""
+        path = self._path(table)
+        fd, tmp_path = tempfile.mkstemp(dir=self.data_dir, prefix=f".{table}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(records, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @contextmanager
+    def transaction(self, table: str) -> Iterator[Dict[str, Dict]]:
+        """
+        Read-modify-write a table atomically.
+
+        Yields the table as a dict, which is saved when the block ends. Nothing is
+        written if the block raises.
+        """
+        self._check_table(table)
+        with self._locks[table]:
+            records = self._load(table)
+            yield records
+            self._save(table, records)
+
+    def get(self, table: str, key: str) -> Optional[Dict]:
+        """Return the record stored under key, or None."""
+        self._check_table(table)
+        with self._locks[table]:
+            return self._load(table).get(key)
+
+    def put(self, table: str, key: str, record: Dict):
+        """Insert or replace the record stored under key."""
+        with self.transaction(table) as records:
+            records[key] = record
+
+    def update(self, table: str, key: str, fields: Dict) -> Optional[Dict]:
+        """
+        Set some fields of a stored record.
+
+        Args:
+            table: Table name
+            key: Record key
+            fields: Fields to set; other fields are left unchanged
+
+        Returns:
+            The updated record, or None if there is no record under key
+        """
+        self._check_table(table)
+        with self._locks[table]:
+            records = self._load(table)
+            if key not in records:
+                return None
+            records[key].update(fields)
+            self._save(table, records)
+            return records[key]
+
+    def delete(self, table: str, key: str) -> bool:
+        """Delete the record stored under key. Returns whether it existed."""
+        self._check_table(table)
+        with self._locks[table]:
+            records = self._load(table)
+            if key not in records:
+                return False
+            del records[key]
+            self._save(table, records)
+            return True
+
+    def all(self, table: str) -> Dict[str, Dict]:
+        """Return every record of a table by key, in insertion order."""
+        self._check_table(table)
+        with self._locks[table]:
+            return self._load(table)
+
+    def find(self, table: str, field: str, value) -> Dict[str, Dict]:
+        """Return the records whose field equals value."""
+        if (table, field) in NOCASE_FIELDS:
+            return {
+                key: record for key, record in self.all(table).items()
+                if str(record.get(field, "")).lower() == value.lower()
+            }
+        return {key: record for key, record in self.all(table).items() if record.get(field) == value}
+
+    def count(self, table: str) -> int:
+        """Return the number of records in a table."""
+        return len(self.all(table))
+
+    def migrate_json(self, data_dir: Path):
+        """Nothing to import: this backend reads the JSON files directly."""
+
+
+class HTTPStore:
+    """
+    Records and job files of the API server, reached by a worker node on another host.
+
+    Records are read and written through the API server's /internal/store
+    endpoints, so job and report updates reach its status cache and /events
+    subscribers as they happen. Only the WORKER_TABLES are available.
+    """
+
+    def __init__(self, api_url: str, token: str):
+        """
+        Args:
+            api_url: Base URL of the API server
+            token: WORKER_TOKEN shared with the API server
+        """
+        self.api_url = api_url.rstrip("/")
+        self._headers = {"Authorization": f"Bearer {token}"}
+        # Retries cover connections refused while the API server restarts
+        self._client = httpx.Client(
+            base_url=self.api_url,
+            headers=self._headers,
+            timeout=HTTP_STORE_TIMEOUT,
+            transport=httpx.HTTPTransport(retries=3),
+        )
+
+    @staticmethod
+    def _check_table(table: str):
+        if table not in WORKER_TABLES:
+            raise ValueError(f"Table not available to worker nodes: {table}")
+
+    def _request(self, method: str, table: str, key: str, **kwargs) -> Optional[httpx.Response]:
+        """Send a record request. Returns None if the record does not exist."""
+        self._check_table(table)
+        response = self._client.request(method, f"/internal/store/{table}/{key}", **kwargs)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response
+
+    def get(self, table: str, key: str) -> Optional[Dict]:
+        """Return the record stored under key, or None."""
+        response = self._request("GET", table, key)
+        return response.json() if response is not None else None
+
+    def put(self, table: str, key: str, record: Dict):
+        """Insert or replace the record stored under key."""
+        self._request("PUT", table, key, json=record)
+
+    def update(self, table: str, key: str, fields: Dict) -> Optional[Dict]:
+        """Set some fields of a record. Returns the updated record, or None if it does not exist."""
+        response = self._request("PATCH", table, key, json=fields)
+        return response.json() if response is not None else None
+
+    def delete(self, table: str, key: str) -> bool:
+        """Delete a record. Returns whether it existed."""
+        return self._request("DELETE", table, key) is not None
+
+    async def download(self, path: str, destination: Path):
+        """Save a file served by the API server at path (e.g. a job's uploaded audio) to destination."""
+        async with httpx.AsyncClient(base_url=self.api_url, headers=self._headers, timeout=HTTP_STORE_TIMEOUT) as client:
+            async with client.stream("GET", path) as response:
+                response.raise_for_status()
+                async with aiofiles.open(destination, "wb") as f:
+                    async for chunk in response.aiter_bytes(HTTP_FILE_CHUNK_SIZE):
+                        await f.write(chunk)
+
+    async def upload(self, path: str, source: Path) -> Dict:
+        """Send a file (e.g. a finished report document) to the API server at path. Returns its response."""
+        async def chunks():
+            async with aiofiles.open(source, "rb") as f:
+                while chunk := await f.read(HTTP_FILE_CHUNK_SIZE):
+                    yield chunk
+
+        async with httpx.AsyncClient(base_url=self.api_url, headers=self._headers, timeout=HTTP_STORE_TIMEOUT) as client:
+            response = await client.put(path, content=chunks())
+            response.raise_for_status()
+            return response.json()
+
+
+def open_store(backend: str, data_dir: Path, database_path: Path) -> Union[SQLiteStore, JsonStore]:
+    """
+    Open the storage backend named by STORAGE_BACKEND.
+
+    Args:
+        backend: "sqlite" or "json"
+        data_dir: Directory holding the JSON files
+        database_path: SQLite database file
+    """
+    if backend == "sqlite":
+        return SQLiteStore(database_path)
+    if backend == "json":
+        return JsonStore(data_dir)
+    raise ValueError(f"Unknown storage backend: {backend}")
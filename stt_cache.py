@@ -0,0 +1,32 @@
+"""
+On-disk cache of STT results per audio segment.
+
+Segments are keyed by a hash of their PCM samples plus the endpoint, model and
+language, so a retried or restarted job only sends the segments that were not
+transcribed yet, and re-stitching a transcript needs no STT calls at all. The cache
+is an SQLite file shared by every process using the same path; the least recently
+used segments are evicted once it holds more than STT_CACHE_MAX_ENTRIES.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+from sqlite_cache import SQLiteLRUCache
+
+STT_CACHE_PATH = os.environ.get("STT_CACHE_PATH", os.path.join(os.environ.get("DATA_DIR", "data"), "stt_cache.db"))
+
+# Maximum number of cached segments (about 30s of audio each); 0 disables the cache
+STT_CACHE_MAX_ENTRIES = int(os.environ.get("STT_CACHE_MAX_ENTRIES", "200000"))
+
+
+def segment_cache_key(samples: np.ndarray, api_base: str, model: str, language: str) -> str:
+    """Return the cache key of a segment transcribed with the given endpoint, model and language."""
+    hasher = hashlib.sha256(np.ascontiguousarray(samples).data)
+    hasher.update(f"|{api_base}|{model}|{language}".encode())
+    return hasher.hexdigest()
+
+
+# Shared by every transcription job in the process
+segment_cache = SQLiteLRUCache(STT_CACHE_PATH, STT_CACHE_MAX_ENTRIES, "STT segment")
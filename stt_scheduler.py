@@ -0,0 +1,159 @@
+"""
+Process-wide scheduler for STT requests of all transcription jobs.
+
+Each STT endpoint gets a global concurrency limit. When a slot frees up it is handed
+to the next job in round-robin order, so a long upload cannot starve a short one.
+A job's requested max_workers only caps its own share and never exceeds the limit.
+"""
+
+import asyncio
+import os
+import threading
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Dict, Deque
+
+# Maximum number of STT requests in flight per endpoint across all jobs
+STT_ENDPOINT_CONCURRENCY = int(os.environ.get("STT_ENDPOINT_CONCURRENCY", "8"))
+
+
+class _Waiter:
+    """A request waiting for a slot; resolved from whichever thread releases one."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.future = loop.create_future()
+        self.granted = False
+
+
+class _EndpointState:
+    """Slots and waiting requests of one endpoint."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.active_per_job: Dict[str, int] = {}
+        self.job_caps: Dict[str, int] = {}
+        # Waiting requests per job, in round-robin order
+        self.waiters: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class STTScheduler:
+    """Fair, globally bounded scheduler for STT requests, keyed by endpoint."""
+
+    def __init__(self, default_limit: int = STT_ENDPOINT_CONCURRENCY, limits: Dict[str, int] = None):
+        self.default_limit = default_limit
+        self.limits = dict(limits or {})
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _EndpointState] = {}
+
+    def _state(self, endpoint: str) -> _EndpointState:
+        state = self._endpoints.get(endpoint)
+        if state is None:
+            state = _EndpointState(self.limits.get(endpoint, self.default_limit))
+            self._endpoints[endpoint] = state
+        return state
+
+    def _grant(self, state: _EndpointState, job_id: str):
+        state.active += 1
+        state.active_per_job[job_id] = state.active_per_job.get(job_id, 0) + 1
+
+    def _dispatch(self, state: _EndpointState):
+        """Hand free slots to waiting jobs in round-robin order. Caller holds the lock."""
+        while state.active < state.limit:
+            for job_id, queue in state.waiters.items():
+                if queue and state.active_per_job.get(job_id, 0) < state.job_caps.get(job_id, state.limit):
+                    break
+            else:
+                return
+            waiter = queue.popleft()
+            # The job goes to the back of the rotation after being served
+            state.waiters.move_to_end(job_id)
+            if not queue:
+                del state.waiters[job_id]
+            waiter.granted = True
+            self._grant(state, job_id)
+            waiter.future.get_loop().call_soon_threadsafe(_wake, waiter.future)
+
+    def _forget_job(self, state: _EndpointState, job_id: str):
+        if not state.active_per_job.get(job_id) and job_id not in state.waiters:
+            state.active_per_job.pop(job_id, None)
+            state.job_caps.pop(job_id, None)
+
+    async def acquire(self, endpoint: str, job_id: str, max_concurrency: int = None):
+        """
+        Wait for an STT slot on an endpoint.
+
+        Args:
+            endpoint: STT API base URL the request is sent to
+            job_id: Job the request belongs to, used for round-robin fairness
+            max_concurrency: Hint for the job's maximum number of requests in flight
+        """
+        with self._lock:
+            state = self._state(endpoint)
+            state.job_caps[job_id] = max(1, min(max_concurrency or state.limit, state.limit))
+            job_active = state.active_per_job.get(job_id, 0)
+            if state.active < state.limit and not state.waiters and job_active < state.job_caps[job_id]:
+                self._grant(state, job_id)
+                return
+            waiter = _Waiter(asyncio.get_running_loop())
+            state.waiters.setdefault(job_id, deque()).append(waiter)
+            # Other waiters may be held back only by their own job caps
+            self._dispatch(state)
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    # The slot arrived as we were cancelled: pass it on
+                    self._release_locked(state, job_id)
+                else:
+                    queue = state.waiters.get(job_id)
+                    if queue is not None:
+                        queue.remove(waiter)
+                        if not queue:
+                            del state.waiters[job_id]
+                    self._forget_job(state, job_id)
+            raise
+
+    def _release_locked(self, state: _EndpointState, job_id: str):
+        state.active -= 1
+        state.active_per_job[job_id] -= 1
+        self._forget_job(state, job_id)
+        self._dispatch(state)
+
+    def release(self, endpoint: str, job_id: str):
+        """Return a slot acquired with acquire()."""
+        with self._lock:
+            self._release_locked(self._endpoints[endpoint], job_id)
+
+    @asynccontextmanager
+    async def slot(self, endpoint: str, job_id: str, max_concurrency: int = None):
+        """Hold an STT slot on an endpoint for the duration of the block."""
+        await self.acquire(endpoint, job_id, max_concurrency)
+        try:
+            yield
+        finally:
+            self.release(endpoint, job_id)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Return in-flight and waiting request counts per endpoint."""
+        with self._lock:
+            return {
+                endpoint: {
+                    "limit": state.limit,
+                    "active": state.active,
+                    "waiting": sum(len(queue) for queue in state.waiters.values()),
+                    "jobs": len(set(state.active_per_job) | set(state.waiters)),
+                }
+                for endpoint, state in self._endpoints.items()
+            }
+
+
+# Shared by every transcription job in the process
+stt_scheduler = STTScheduler()
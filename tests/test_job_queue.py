@@ -0,0 +1,46 @@
+import sqlite3
+import time
+
+from job_queue import SQLiteJobQueue
+
+
+def test_group_cannot_take_every_worker(tmp_path):
+    queue = SQLiteJobQueue(tmp_path / "queue.db", group_limit=1)
+    for n in range(3):
+        queue.enqueue("report", f"batch-{n}", group="batch")
+    queue.enqueue("report", "single")
+
+    assert queue.claim("report", "w1") == ("batch-0", 1)
+    # The rest of the batch waits; the later single report runs next
+    assert queue.claim("report", "w2") == ("single", 1)
+    assert queue.claim("report", "w3") is None
+
+    queue.complete("batch-0", "w1")
+    assert queue.claim("report", "w1") == ("batch-1", 1)
+
+
+def test_expired_lease_frees_group_slot(tmp_path):
+    queue = SQLiteJobQueue(tmp_path / "queue.db", lease_seconds=0.01, group_limit=1)
+    queue.enqueue("report", "a", group="batch")
+    queue.enqueue("report", "b", group="batch")
+
+    assert queue.claim("report", "w1") == ("a", 1)
+    time.sleep(0.02)
+    # The abandoned job is the oldest runnable one and is taken over first
+    assert queue.claim("report", "w2") == ("a", 2)
+
+
+def test_queue_without_groups_is_migrated(tmp_path):
+    path = tmp_path / "queue.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE queue (id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, "
+        "attempts INTEGER NOT NULL DEFAULT 0, worker TEXT, lease_expires REAL, "
+        "enqueued_at REAL NOT NULL, error TEXT)"
+    )
+    conn.execute("INSERT INTO queue (id, kind, status, enqueued_at) VALUES ('old', 'report', 'queued', 0)")
+    conn.commit()
+    conn.close()
+
+    queue = SQLiteJobQueue(path)
+    assert queue.claim("report", "w1") == ("old", 1)
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from transcribe_audio import AudioTranscriber
+
+
+def spans(chunks):
+    return [(chunk.start_ms, chunk.end_ms, len(chunk.samples)) for chunk in chunks]
+
+
+@pytest.mark.parametrize("length", [100, 95_999, 480_000, 480_005, 955_217, 960_015])
+def test_streaming_matches_split(length):
+    transcriber = AudioTranscriber(segment_length=30000, overlap=300)
+    pcm = np.arange(length, dtype=np.int16)
+    # Feed the stream in uneven blocks, as pipe reads arrive
+    transcriber.stream_pcm = lambda input_path, read_size: iter(np.array_split(pcm, 7))
+
+    streamed = list(transcriber.stream_pcm_chunks("audio.wav"))
+    assert spans(streamed) == spans(transcriber.split_pcm(pcm))
+    for chunk, split_chunk in zip(streamed, transcriber.split_pcm(pcm)):
+        assert np.array_equal(chunk.samples, split_chunk.samples)
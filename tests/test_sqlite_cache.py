@@ -0,0 +1,32 @@
+from sqlite_cache import SQLiteLRUCache
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = SQLiteLRUCache(tmp_path / "cache.db", max_entries=2, label="test")
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+    cache.put("c", "3")
+    cache.evict()
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_deleted_entry_is_gone(tmp_path):
+    cache = SQLiteLRUCache(tmp_path / "cache.db", max_entries=10, label="test")
+    cache.put("a", "1")
+    assert cache.get("a") == "1"
+    cache.delete("a")
+    cache.put("b", "2")
+
+    # A pending last-used update must not bring the entry back
+    assert cache.get("a") is None
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = SQLiteLRUCache(tmp_path / "cache.db", max_entries=0, label="test")
+    cache.put("a", "1")
+    assert cache.get("a") is None
+    assert not (tmp_path / "cache.db").exists()
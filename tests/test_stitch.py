@@ -0,0 +1,49 @@
+from transcribe_audio import AudioTranscriber, align_seam, seam_window
+
+
+def stitch(texts, spans):
+    return AudioTranscriber(segment_length=30000, overlap=300).stitch_segments(texts, spans)
+
+
+def test_overlap_word_kept_once():
+    assert stitch(
+        ["we agreed to move on to item two", "two the chair asked about the budget"],
+        [(0, 30000), (29700, 59700)],
+    ) == ["we agreed to move on to item two", "the chair asked about the budget"]
+
+
+def test_repeated_phrase_near_seam_is_kept():
+    # "the budget of the" appears on both sides, but not at the seam
+    texts = [
+        "we then discussed the budget of the project and agreed to move on to item two",
+        "two the chair asked about the budget of the department for next year",
+    ]
+    left, right = stitch(texts, [(0, 30000), (29700, 59700)])
+    assert left == texts[0]
+    assert right == "the chair asked about the budget of the department for next year"
+
+
+def test_repeated_phrase_without_shared_overlap_is_kept():
+    texts = ["the budget of the project was approved", "the budget of the project was approved again"]
+    assert stitch(texts, [(0, 30000), (29700, 59700)]) == texts
+
+
+def test_overlap_with_garbled_edge_tokens():
+    # The left segment cut its last word short and the right one heard a partial word first
+    assert align_seam(
+        "please review the minutes tod".split(), "ay the minutes today we begin".split(), window=5
+    ) == (4, 3)
+
+
+def test_single_word_away_from_seam_is_ignored():
+    assert align_seam("the report is ready now".split(), "okay the next item".split(), window=3) == (5, 0)
+
+
+def test_segments_without_overlap_are_untouched():
+    texts = ["item two is closed", "two more items remain"]
+    assert stitch(texts, [(0, 30000), (30000, 60000)]) == texts
+
+
+def test_window_follows_overlap():
+    assert seam_window(300) == 3
+    assert seam_window(2000) == 8
@@ -1,17 +1,31 @@
 import asyncio
+import io
+import math
+import multiprocessing
 import os
+import queue
+import random
+import re
 import sys
+import threading
+import time
+import uuid
+import wave
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, NamedTuple, Union, Iterator, Iterable, Callable, Optional
 
-from pydub import AudioSegment
-from openai import OpenAI, AsyncOpenAI
+import ffmpeg
+import httpx
+import numpy as np
+from openai import OpenAI, AsyncOpenAI, APIConnectionError, APIStatusError
 import nltk
 from nltk.tokenize import word_tokenize
 from nltk.util import ngrams
 
-import uuid
-import shutil
+from stt_cache import segment_cache, segment_cache_key
+from stt_scheduler import stt_scheduler
 
 # Configuration variables
 API_BASE = "http://60.51.17.97:9801/v1"
@@ -19,6 +33,39 @@ API_BASE_MALAYSIA = "http://60.51.17.97:7801/v1"
 TRANSCRIPTION_MODEL = "stt_model"
 TRANSCRIPTION_MODEL_MALAYSIA = "stt_model"
 
+# Keep-alive connection pool used by every STT client. Segments of all jobs share these
+# connections, so the pool is sized for the total number of concurrent STT requests.
+STT_POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=120.0)
+
+# Retry policy for transient STT failures (connection errors, timeouts, 429 and 5xx responses).
+# A segment is retried until STT_RETRY_BUDGET seconds have passed since its first failure,
+# so a short outage of the STT endpoint delays the transcript instead of losing text.
+STT_RETRY_BUDGET = float(os.environ.get("STT_RETRY_BUDGET", "180"))
+STT_RETRY_BASE_DELAY = float(os.environ.get("STT_RETRY_BASE_DELAY", "1"))  # Seconds before the first retry, doubled on every attempt
+STT_RETRY_MAX_DELAY = float(os.environ.get("STT_RETRY_MAX_DELAY", "30"))  # Cap on the backoff delay
+
+# Audio is decoded once to 16 kHz mono 16-bit PCM, the format the STT model expects
+STT_SAMPLE_RATE = 16000
+STT_SAMPLE_WIDTH = 2
+
+# Voice activity detection settings used by the "vad" segmentation mode
+VAD_FRAME_MS = 30  # Analysis frame length
+VAD_MIN_SILENCE_MS = 500  # Shorter pauses do not split an utterance
+VAD_MIN_SPEECH_MS = 250  # Shorter bursts of energy are treated as noise
+VAD_SPEECH_PAD_MS = 200  # Audio kept around each utterance so word edges are not clipped
+VAD_THRESHOLD_MARGIN_DB = 10.0  # Speech must be this much louder than the noise floor
+VAD_MIN_THRESHOLD_DBFS = -80.0  # Lower bound for the speech threshold, only to ignore dither on digital silence
+VAD_MAX_THRESHOLD_DBFS = -30.0  # Upper bound so audio without pauses is still detected as speech
+
+# Duplicated overlap text at a segment boundary is searched for in about as many tokens as
+# the overlap can hold (speech runs at roughly 3 tokens per second), plus a few tokens of
+# slack for words the STT model cut or garbled at the segment edges
+SEAM_TOKENS_PER_SECOND = 3.0
+SEAM_SLACK_TOKENS = 2
+
+# Processes decoding and segmenting audio for all jobs; 0 decodes in a thread of the calling process
+DECODE_WORKERS = int(os.environ.get("DECODE_WORKERS", str(os.cpu_count() or 1)))
+
 # Download required NLTK data
 try:
     nltk.data.find('tokenizers/punkt')
@@ -26,6 +73,276 @@ except LookupError:
     nltk.download('punkt')
 
 
+# Process-wide STT clients, one per endpoint. Async clients are kept per event loop
+# because their connection pools cannot be shared between loops.
+_client_lock = threading.Lock()
+_stt_clients: Dict[Tuple[str, str], OpenAI] = {}
+_async_stt_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str], AsyncOpenAI]]" = weakref.WeakKeyDictionary()
+
+
+def get_stt_client(api_base: str = API_BASE, api_key: str = "EMPTY") -> OpenAI:
+    """Return the long-lived OpenAI client for an STT endpoint, creating it on first use."""
+    with _client_lock:
+        client = _stt_clients.get((api_base, api_key))
+        if client is None:
+            client = OpenAI(api_key=api_key, base_url=api_base, http_client=httpx.Client(limits=STT_POOL_LIMITS))
+            _stt_clients[(api_base, api_key)] = client
+        return client
+
+
+def get_async_stt_client(api_base: str = API_BASE, api_key: str = "EMPTY") -> AsyncOpenAI:
+    """Return the long-lived AsyncOpenAI client for an STT endpoint on the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        clients = _async_stt_clients.setdefault(loop, {})
+        client = clients.get((api_base, api_key))
+        if client is None:
+            # Retries are handled by transcribe_file_async so failed segments can yield to healthy work
+            client = AsyncOpenAI(api_key=api_key, base_url=api_base, max_retries=0, http_client=httpx.AsyncClient(limits=STT_POOL_LIMITS))
+            clients[(api_base, api_key)] = client
+        return client
+
+
+async def close_async_stt_clients():
+    """Close the async STT clients of the running event loop, e.g. on application shutdown."""
+    with _client_lock:
+        clients = _async_stt_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.close()
+
+
+def is_transient_stt_error(error: Exception) -> bool:
+    """Return True if an STT request failed in a way that is worth retrying."""
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, (APIConnectionError, httpx.TransportError, ConnectionError, TimeoutError))
+
+
+def stt_retry_delay(attempt: int) -> float:
+    """Capped exponential backoff with full jitter for the given (1-based) failed attempt."""
+    return random.uniform(0, min(STT_RETRY_MAX_DELAY, STT_RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+
+
+class IncompleteTranscriptionError(RuntimeError):
+    """
+    Raised when some segments could not be transcribed even after retries.
+    
+    The transcript built from the remaining segments is still saved and is available as
+    `transcript`; `missing_segments` lists the segments whose text is missing.
+    """
+    
+    def __init__(self, transcript: str, missing_segments: List[Dict]):
+        super().__init__(f"{len(missing_segments)} segment(s) could not be transcribed")
+        self.transcript = transcript
+        self.missing_segments = missing_segments
+
+
+class TranscriptionProgress(NamedTuple):
+    """Snapshot passed to the progress callback of transcribe_file_async after each segment."""
+    segments_done: int
+    segments_total: int  # Segments produced so far while decoding_done is False
+    decoding_done: bool
+    eta_seconds: Optional[float]  # None until the total number of segments is known
+
+
+class AudioChunk(NamedTuple):
+    """A slice of the decoded PCM buffer that is sent to the STT model as one request."""
+    index: int
+    start_ms: int
+    end_ms: int
+    samples: np.ndarray
+
+
+def pcm_to_wav_bytes(samples: np.ndarray, sample_rate: int = STT_SAMPLE_RATE) -> bytes:
+    """
+    Wrap int16 mono PCM samples in an in-memory WAV container.
+    
+    Args:
+        samples: 1-D int16 array (may be a view into a larger buffer)
+        sample_rate: Sample rate of the PCM data
+        
+    Returns:
+        WAV file contents as bytes
+    """
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(STT_SAMPLE_WIDTH)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(memoryview(np.ascontiguousarray(samples)).cast("B"))
+    return buffer.getvalue()
+
+
+def frame_levels_db(samples: np.ndarray, frame_len: int) -> np.ndarray:
+    """Return the RMS level in dBFS of each complete frame of int16 samples."""
+    n_frames = len(samples) // frame_len
+    frames = samples[:n_frames * frame_len].reshape(n_frames, frame_len).astype(np.float32)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return 20 * np.log10(rms / 32768.0 + 1e-10)
+
+
+def speech_regions(is_speech: np.ndarray, min_silence_frames: int, min_speech_frames: int) -> List[Tuple[int, int]]:
+    """
+    Turn a per-frame speech mask into (start, end) frame ranges of utterances.
+    
+    Gaps shorter than min_silence_frames are bridged and utterances shorter than
+    min_speech_frames are discarded.
+    """
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], is_speech, [False])).astype(np.int8)))
+    regions = []
+    for start, end in zip(edges[::2].tolist(), edges[1::2].tolist()):
+        if regions and start - regions[-1][1] < min_silence_frames:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    return [(start, end) for start, end in regions if end - start >= min_speech_frames]
+
+
+def _seam_token(token: str) -> str:
+    """Normalise a token for seam comparison, ignoring case and punctuation."""
+    return re.sub(r"[^\w]", "", token.lower())
+
+
+def seam_window(overlap_ms: int) -> int:
+    """Return the number of tokens on each side of a seam that can hold overlap_ms of shared audio."""
+    return max(1, math.ceil(overlap_ms * SEAM_TOKENS_PER_SECOND / 1000)) + SEAM_SLACK_TOKENS
+
+
+def align_seam(left: List[str], right: List[str], window: int, slack: int = SEAM_SLACK_TOKENS) -> Tuple[int, int]:
+    """
+    Find where the tokens of two overlapping segments should be joined.
+    
+    Only a token run that ends the last `window` tokens of left and starts the first
+    `window` tokens of right, give or take `slack` tokens at each edge, is treated as
+    the audio both segments heard. A phrase repeated anywhere else near the seam is
+    real speech and is kept.
+    
+    Args:
+        left: Tokens of the earlier segment
+        right: Tokens of the later segment
+        window: Number of tokens searched on each side of the seam
+        slack: Tokens allowed after the run in left and before it in right
+        
+    Returns:
+        (number of left tokens to keep, number of right tokens to drop)
+    """
+    tail = [_seam_token(token) for token in left[-window:]]
+    head = [_seam_token(token) for token in right[:window]]
+    
+    # Longest run that is a suffix of tail and a prefix of head up to the slack,
+    # preferring the one closest to the seam on ties
+    best = (0, 0, 0, 0)  # (length, -distance from the seam, tail end, head start)
+    for tail_end in range(len(tail), max(len(tail) - slack, 0) - 1, -1):
+        for head_start in range(min(slack, len(head) - 1) + 1):
+            length = next((
+                n for n in range(min(tail_end, len(head) - head_start), 0, -1)
+                if tail[tail_end - n:tail_end] == head[head_start:head_start + n] and all(tail[tail_end - n:tail_end])
+            ), 0)
+            if length == 0:
+                continue
+            distance = (len(tail) - tail_end) + head_start
+            best = max(best, (length, -distance, tail_end, head_start))
+    
+    length, neg_distance, tail_end, head_start = best
+    # A single shared word only counts when it sits exactly on the seam
+    if length == 0 or (length == 1 and neg_distance != 0):
+        return len(left), 0
+    return len(left) - len(tail) + tail_end, head_start + length
+
+
+# Process pool shared by all jobs for the CPU-bound decode stage, started on first use
+_decode_lock = threading.Lock()
+_decode_pool: Optional[ProcessPoolExecutor] = None
+_decode_manager = None
+
+
+def get_decode_pool():
+    """Return the (process pool, manager) pair of the decode stage, starting them on first use."""
+    global _decode_pool, _decode_manager
+    with _decode_lock:
+        if _decode_pool is None:
+            # forkserver avoids forking a process that is running threads, and unlike spawn
+            # it does not re-import the main module in every worker
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _decode_manager = context.Manager()
+            _decode_pool = ProcessPoolExecutor(max_workers=DECODE_WORKERS, mp_context=context)
+        return _decode_pool, _decode_manager
+
+
+def shutdown_decode_pool():
+    """Stop the decode processes, e.g. on application shutdown."""
+    global _decode_pool, _decode_manager
+    with _decode_lock:
+        if _decode_pool is not None:
+            _decode_pool.shutdown(cancel_futures=True)
+            _decode_manager.shutdown()
+            _decode_pool = _decode_manager = None
+
+
+def _decode_segments(audio_path: str, segment_length: int, overlap: int, streaming: bool, segmentation: str, chunks, stop) -> int:
+    """
+    Decode and segment an audio file in a decode pool process.
+    
+    Puts every AudioChunk on the chunks queue as soon as it is cut, then None.
+    Stops early once the stop event is set. Returns the number of chunks produced.
+    """
+    transcriber = AudioTranscriber(segment_length=segment_length, overlap=overlap)
+    count = 0
+    try:
+        for chunk in transcriber._segment_source(audio_path, streaming, segmentation):
+            if stop.is_set():
+                break
+            chunks.put(chunk)
+            count += 1
+    finally:
+        chunks.put(None)
+    return count
+
+
+class PooledSegments:
+    """Iterator over the segments of an audio file produced by a decode pool process."""
+    
+    def __init__(self, transcriber: "AudioTranscriber", audio_path: str, streaming: bool, segmentation: str):
+        pool, manager = get_decode_pool()
+        self._chunks = manager.Queue()
+        self._stop = manager.Event()
+        self._future: Future = pool.submit(
+            _decode_segments, audio_path, transcriber.segment_length, transcriber.overlap,
+            streaming, segmentation, self._chunks, self._stop
+        )
+        self._finished = False
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self) -> AudioChunk:
+        if self._finished:
+            raise StopIteration
+        while True:
+            try:
+                chunk = self._chunks.get(timeout=1.0)
+                break
+            except queue.Empty:
+                # A crashed decode process never sends the end marker
+                if self._future.done() and self._future.exception() is not None:
+                    self._finished = True
+                    raise self._future.exception()
+        if chunk is None:
+            self._finished = True
+            # Raise the decoder's error, if any
+            self._future.result()
+            raise StopIteration
+        return chunk
+    
+    def cancel(self):
+        """Ask the decode process to stop producing segments."""
+        self._stop.set()
+        if self._future.cancel():
+            # Never started: wake up a reader waiting for the end of the segments
+            self._chunks.put(None)
+
+
 class AudioTranscriber:
     """
     A class to handle transcription of long audio files by segmenting them into
@@ -38,167 +355,347 @@ class AudioTranscriber:
         
         Args:
             api_key: API key for authentication
-            api_base: Base URL for the API
+            api_base: Default base URL for transcribe_segment
             segment_length: Length of each audio segment in milliseconds (default: 30 seconds)
             overlap: Overlap between segments in milliseconds (default: 500ms)
+        
+        Creating a transcriber is cheap: HTTP clients come from the process-wide registry
+        (get_stt_client / get_async_stt_client) and are shared by all transcribers.
         """
-        self.client = OpenAI(api_key=api_key, base_url=api_base)
-        self.async_client = AsyncOpenAI(api_key=api_key, base_url=api_base)
+        self.api_key = api_key
+        self.api_base = api_base
         # Segment length in milliseconds (30 seconds)
         self.segment_length = segment_length
         # Overlap between segments in milliseconds (500ms = 0.5 seconds)
         self.overlap = overlap
     
-    def convert_to_wav(self, input_path: str) -> tuple:
+    def decode_audio(self, input_path: str) -> np.ndarray:
         """
-        Convert any audio/video file to WAV format.
-        Returns a tuple containing (path to converted file, path to temp directory).
+        Decode any audio/video file into a mono int16 PCM buffer at the STT sample rate.
+        
+        ffmpeg decodes and resamples in a single pass and streams raw PCM over a pipe,
+        so no intermediate WAV file is written to disk.
+        
+        Args:
+            input_path: Path to the input audio/video file
+            
+        Returns:
+            1-D NumPy int16 array of samples at STT_SAMPLE_RATE
         """
         if not os.path.exists(input_path):
             raise FileNotFoundError(f"Input file not found: {input_path}")
-            
-        # Load the audio file (pydub can handle various formats including MP4)
-        audio = AudioSegment.from_file(input_path)
-        
-        # Create output path for WAV file in temp directory
-
-        # Create a unique temp directory using UUID to avoid conflicts in concurrent sessions
-        unique_id = uuid.uuid4().hex[:8]
-        temp_dir = Path(__file__).parent / "temp" / unique_id
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        output_path = temp_dir / f"{Path(input_path).stem}_converted.wav"
         
-        # Export as WAV
-        audio.export(output_path, format="wav")
-        print(f"Converted {input_path} to {output_path}")
+        try:
+            raw_pcm, _ = (
+                ffmpeg
+                .input(input_path)
+                .output("pipe:", format="s16le", acodec="pcm_s16le", ac=1, ar=STT_SAMPLE_RATE)
+                .global_args("-nostdin", "-loglevel", "error")
+                .run(capture_stdout=True, capture_stderr=True)
+            )
+        except ffmpeg.Error as e:
+            raise RuntimeError(f"Failed to decode {input_path}: {e.stderr.decode(errors='ignore').strip()}")
         
-        return output_path, temp_dir
+        pcm = np.frombuffer(raw_pcm, dtype=np.int16)
+        print(f"Decoded {input_path}: {len(pcm) / STT_SAMPLE_RATE:.1f}s of audio")
+        return pcm
     
-    def split_audio(self, audio_path: str) -> List[str]:
+    def split_pcm(self, pcm: np.ndarray) -> List[AudioChunk]:
         """
-        Split audio file into segments of specified length with overlap between segments.
-        Returns a list of paths to the segment files.
+        Split a decoded PCM buffer into segments of specified length with overlap between segments.
+        Returns a list of AudioChunk whose samples are zero-copy views into pcm.
         
         The first segment starts at 0ms, and subsequent segments are created with
         an overlap of self.overlap milliseconds to ensure continuity in transcription.
         """
-        # Initialize temp_dir_created variable
-        temp_dir_created = None
-        
-        # Convert to WAV if needed and create temp directory for segments
-        if not audio_path.lower().endswith('.wav'):
-            audio_path, temp_dir_created = self.convert_to_wav(audio_path)
-        else:
-            # For already WAV files, we'll create a temp directory to store segments
-            unique_id = uuid.uuid4().hex[:8]
-            temp_dir_created = Path(__file__).parent / "temp" / unique_id
-            temp_dir_created.mkdir(parents=True, exist_ok=True)
-            # Update audio_path to be within the temp directory for consistency
-            new_audio_path = temp_dir_created / Path(audio_path).name
-            shutil.copy2(audio_path, new_audio_path)
-            audio_path = str(new_audio_path)
-            
-        # Ensure temp_dir_created is set for cleanup
-        if temp_dir_created is None:
-            # This should not happen, but just in case
-            unique_id = uuid.uuid4().hex[:8]
-            temp_dir_created = Path(__file__).parent / "temp" / unique_id
-            temp_dir_created.mkdir(parents=True, exist_ok=True)
-        
-        audio = AudioSegment.from_wav(audio_path)
-        duration_ms = len(audio)
-        
-        segment_files = []
+        duration_ms = len(pcm) * 1000 // STT_SAMPLE_RATE
         # Step size is segment length minus overlap
         step_size = self.segment_length - self.overlap
         
-        for i, start_ms in enumerate(range(0, duration_ms, step_size)):
+        chunks = []
+        for start_ms in range(0, duration_ms, step_size):
             end_ms = min(start_ms + self.segment_length, duration_ms)
-            segment = audio[start_ms:end_ms]
+            samples = pcm[start_ms * STT_SAMPLE_RATE // 1000:end_ms * STT_SAMPLE_RATE // 1000]
             
             # Only create segment if it has some audio (handles edge case near end)
-            if len(segment) > 0:
-                # Use the same unique temp directory as created during conversion
-                # Get the parent temp directory from the audio_path
-                temp_dir = Path(audio_path).parent
-                segment_filename = temp_dir / f"segment_{i:03d}.wav"
-                segment.export(segment_filename, format="wav")
-                segment_files.append(str(segment_filename))
-                # Convert ms to seconds for display
-                start_sec = start_ms // 1000
-                end_sec = end_ms // 1000
-                print(f"Created segment: {segment_filename} ({start_sec}-{end_sec}s)")
+            if len(samples) > 0:
+                chunks.append(AudioChunk(len(chunks), start_ms, end_ms, samples))
             
             # Break if this segment reaches the end of the audio
             if end_ms >= duration_ms:
                 break
         
-        return segment_files, temp_dir_created
+        print(f"Split audio into {len(chunks)} segments")
+        return chunks
+    
+    def stream_pcm(self, input_path: str, read_size: int = 64 * 1024) -> Iterator[np.ndarray]:
+        """
+        Decode an audio/video file through an ffmpeg pipe and yield the PCM as it is produced.
+        
+        Args:
+            input_path: Path to the input audio/video file
+            read_size: Number of bytes to read from the ffmpeg pipe at a time
+            
+        Yields:
+            1-D NumPy int16 arrays of consecutive samples at STT_SAMPLE_RATE
+        """
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+        
+        process = (
+            ffmpeg
+            .input(input_path)
+            .output("pipe:", format="s16le", acodec="pcm_s16le", ac=1, ar=STT_SAMPLE_RATE)
+            .global_args("-nostdin", "-loglevel", "error")
+            .run_async(pipe_stdout=True, pipe_stderr=True)
+        )
+        
+        leftover = b""
+        try:
+            while True:
+                data = process.stdout.read(read_size)
+                if not data:
+                    break
+                # Pipe reads may end mid-sample; carry the odd byte over to the next read
+                data = leftover + data
+                usable = len(data) - len(data) % STT_SAMPLE_WIDTH
+                leftover = data[usable:]
+                if usable:
+                    yield np.frombuffer(data[:usable], dtype=np.int16)
+            
+            process.wait()
+            if process.returncode != 0:
+                error = process.stderr.read().decode(errors="ignore").strip()
+                raise RuntimeError(f"Failed to decode {input_path}: {error}")
+        finally:
+            # Stop ffmpeg if the consumer stopped early
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            process.stderr.close()
+    
+    def stream_pcm_chunks(self, input_path: str, read_size: int = 64 * 1024) -> Iterator[AudioChunk]:
+        """
+        Decode an audio/video file through an ffmpeg pipe and yield overlapping segments
+        as soon as enough PCM has been read, instead of decoding the whole file first.
+        
+        Windows follow the same schedule as split_pcm, so both modes produce identical segments.
+        
+        Args:
+            input_path: Path to the input audio/video file
+            read_size: Number of bytes to read from the ffmpeg pipe at a time
+            
+        Yields:
+            AudioChunk objects in order; each owns its samples
+        """
+        step_size = self.segment_length - self.overlap
+        samples_per_ms = STT_SAMPLE_RATE // 1000
+        segment_samples = self.segment_length * samples_per_ms
+        step_samples = step_size * samples_per_ms
+        
+        buffer = np.zeros(0, dtype=np.int16)
+        start_ms = 0
+        index = 0
+        for block in self.stream_pcm(input_path, read_size):
+            buffer = np.concatenate((buffer, block))
+            
+            # Emit every full window that is available so far
+            while len(buffer) >= segment_samples:
+                yield AudioChunk(index, start_ms, start_ms + self.segment_length, buffer[:segment_samples].copy())
+                buffer = buffer[step_samples:]
+                start_ms += step_size
+                index += 1
+        
+        # Emit the tail in whole milliseconds, as split_pcm does, unless it is only the
+        # overlap of a window that already reached the end
+        tail_ms = len(buffer) // samples_per_ms
+        if tail_ms > self.overlap or (index == 0 and tail_ms > 0):
+            yield AudioChunk(index, start_ms, start_ms + tail_ms, buffer[:tail_ms * samples_per_ms].copy())
     
-    def transcribe_segment(self, segment_path: str, api_base: str = API_BASE, model: str = TRANSCRIPTION_MODEL, language: str = "en") -> str:
+    def iter_vad_chunks(self, pcm_blocks: Iterable[np.ndarray]) -> Iterator[AudioChunk]:
+        """
+        Segment PCM on pauses in speech using an energy-based voice activity detector.
+        
+        Frames louder than an adaptive noise-floor threshold count as speech. Utterances
+        are merged into windows of at most self.segment_length, windows are cut inside
+        pauses and silence between windows is dropped. An utterance longer than the
+        maximum window is cut at its quietest frame.
+        
+        Args:
+            pcm_blocks: Consecutive int16 PCM blocks, e.g. [decode_audio(path)] or stream_pcm(path).
+                A single block is sliced without copying.
+            
+        Yields:
+            AudioChunk objects in order, with timestamps relative to the start of the audio
+        """
+        frame_len = STT_SAMPLE_RATE * VAD_FRAME_MS // 1000
+        max_frames = self.segment_length // VAD_FRAME_MS
+        silence_frames = VAD_MIN_SILENCE_MS // VAD_FRAME_MS
+        speech_frames = -(-VAD_MIN_SPEECH_MS // VAD_FRAME_MS)
+        pad_frames = VAD_SPEECH_PAD_MS // VAD_FRAME_MS
+        # Frames that must be visible to place a window cut with confidence
+        lookahead = max_frames + silence_frames + pad_frames
+        
+        blocks = iter(pcm_blocks)
+        buffer = np.zeros(0, dtype=np.int16)
+        buffer_start = 0  # Absolute sample index of buffer[0]
+        offset = 0  # Samples of the buffer already consumed
+        final = False
+        noise_floor = None
+        index = 0
+        
+        while True:
+            available = (len(buffer) - offset) // frame_len
+            if not final and available < lookahead:
+                block = next(blocks, None)
+                if block is None:
+                    final = True
+                elif offset >= len(buffer):
+                    buffer_start += len(buffer)
+                    buffer, offset = block, 0
+                else:
+                    buffer_start += offset
+                    buffer, offset = np.concatenate((buffer[offset:], block)), 0
+                continue
+            if available == 0:
+                break
+            at_end = final and available <= lookahead
+            
+            levels = frame_levels_db(buffer[offset:offset + lookahead * frame_len], frame_len)
+            window_floor = float(np.percentile(levels, 10))
+            noise_floor = window_floor if noise_floor is None else min(noise_floor, window_floor)
+            threshold = min(max(noise_floor + VAD_THRESHOLD_MARGIN_DB, VAD_MIN_THRESHOLD_DBFS), VAD_MAX_THRESHOLD_DBFS)
+            regions = speech_regions(levels > threshold, silence_frames, speech_frames)
+            n_frames = len(levels)
+            
+            if not regions:
+                if at_end:
+                    break
+                # Only silence so far: drop it, keeping a pad's worth in case speech starts at the edge
+                offset += (n_frames - pad_frames) * frame_len
+                continue
+            
+            first_start = max(0, regions[0][0] - pad_frames)
+            limit = first_start + max_frames
+            if not at_end and limit + silence_frames > n_frames:
+                # Skip leading silence so the whole window fits in the analysed frames
+                offset += first_start * frame_len
+                continue
+            
+            fitting = [end for _, end in regions if min(end + pad_frames, n_frames) <= limit]
+            if fitting:
+                # Cut in the pause after the last utterance that fits in the window
+                cut = min(fitting[-1] + pad_frames, n_frames)
+            else:
+                # A single utterance is longer than the window: cut at its quietest frame
+                search_start = first_start + max_frames // 2
+                search_end = min(limit, n_frames)
+                cut = search_start + int(np.argmin(levels[search_start:search_end]))
+            
+            start_sample = offset + first_start * frame_len
+            end_sample = offset + cut * frame_len
+            yield AudioChunk(
+                index,
+                (buffer_start + start_sample) * 1000 // STT_SAMPLE_RATE,
+                (buffer_start + end_sample) * 1000 // STT_SAMPLE_RATE,
+                buffer[start_sample:end_sample],
+            )
+            index += 1
+            offset = end_sample
+            if at_end and len(fitting) == len(regions):
+                break
+    
+    def _segment_upload(self, segment: Union[str, AudioChunk]) -> Tuple[str, bytes, str]:
+        """Build the (filename, content, mime type) tuple sent to the STT API for a segment."""
+        if isinstance(segment, AudioChunk):
+            return (f"segment_{segment.index:03d}.wav", pcm_to_wav_bytes(segment.samples), "audio/wav")
+        with open(segment, "rb") as f:
+            return (Path(segment).name, f.read(), "audio/wav")
+    
+    def transcribe_segment(self, segment: Union[str, AudioChunk], api_base: str = None, model: str = TRANSCRIPTION_MODEL, language: str = "en") -> str:
         """
         Transcribe a single audio segment synchronously.
         
         Args:
-            segment_path: Path to the audio segment file
-            api_base: API base URL for the transcription service
+            segment: In-memory AudioChunk, or path to an audio segment file
+            api_base: API base URL for the transcription service (defaults to the transcriber's)
             model: Model name to use for transcription
             language: Language code for transcription
             
         Returns:
             Transcribed text
         """
-        # Update client with the specified API base
-        self.client.base_url = api_base
-        
-        with open(segment_path, "rb") as f:
-            kwargs = {
-                "file": f,
-                "model": model,
-                "response_format": "json",
-                "temperature": 0.0,
-                "extra_body": dict(
-                    seed=42,
-                    repetition_penalty=1.2,
-                ),
-            }
-            if language.lower() != "auto":
-                kwargs["language"] = language
-            print(kwargs)
-            transcription = self.client.audio.transcriptions.create(**kwargs)
+        client = get_stt_client(api_base or self.api_base, self.api_key)
+        
+        kwargs = {
+            "model": model,
+            "response_format": "json",
+            "temperature": 0.0,
+            "extra_body": dict(
+                seed=42,
+                repetition_penalty=1.2,
+            ),
+        }
+        if language.lower() != "auto":
+            kwargs["language"] = language
+        print(kwargs)
+        transcription = client.audio.transcriptions.create(file=self._segment_upload(segment), **kwargs)
         return transcription.text
     
-    async def transcribe_segment_async(self, segment_path: str, api_base: str = API_BASE, model: str = TRANSCRIPTION_MODEL, language: str = "en") -> str:
+    async def transcribe_segment_async(self, segment: Union[str, AudioChunk], api_base: str = None, model: str = TRANSCRIPTION_MODEL, language: str = "en") -> str:
         """
         Transcribe a single audio segment asynchronously.
         
         Args:
-            segment_path: Path to the audio segment file
-            api_base: API base URL for the transcription service
+            segment: In-memory AudioChunk, or path to an audio segment file
+            api_base: API base URL for the transcription service (defaults to the transcriber's)
             model: Model name to use for transcription
             language: Language code for transcription
             
         Returns:
             Transcribed text
         """
-        # Update async client with the specified API base
-        self.async_client.base_url = api_base
-        
-        with open(segment_path, "rb") as f:
-            transcription = await self.async_client.audio.transcriptions.create(
-                file=f,
-                model=model,
-                language=language,
-                response_format="json",
-                temperature=0.0,
-                extra_body=dict(
-                    seed=420,
-                    repetition_penalty=1.5,
-                    top_p=0.7
-                ),
-            )
+        client = get_async_stt_client(api_base or self.api_base, self.api_key)
+        
+        kwargs = {
+            "model": model,
+            "response_format": "json",
+            "temperature": 0.0,
+            "extra_body": dict(
+                seed=42,
+                repetition_penalty=1.2,
+            ),
+        }
+        if language.lower() != "auto":
+            kwargs["language"] = language
+        transcription = await client.audio.transcriptions.create(file=self._segment_upload(segment), **kwargs)
         return transcription.text
     
+    def stitch_segments(self, texts: List[str], spans: List[Tuple[int, int]]) -> List[str]:
+        """
+        Remove text duplicated by the audio overlap between consecutive segments.
+        
+        Only the seam between segments whose time spans overlap is touched, so repeated
+        words elsewhere in the transcript are left alone.
+        
+        Args:
+            texts: Transcribed text of each segment, in order
+            spans: (start_ms, end_ms) of each segment
+            
+        Returns:
+            Segment texts with the overlap at each seam kept only once
+        """
+        tokens = [text.split() for text in texts]
+        for i in range(len(tokens) - 1):
+            if spans[i][1] <= spans[i + 1][0] or not tokens[i] or not tokens[i + 1]:
+                continue
+            window = seam_window(spans[i][1] - spans[i + 1][0])
+            keep_left, drop_right = align_seam(tokens[i], tokens[i + 1], window)
+            tokens[i] = tokens[i][:keep_left]
+            tokens[i + 1] = tokens[i + 1][drop_right:]
+        return [' '.join(segment_tokens) for segment_tokens in tokens]
+    
     def _ms_to_srt_time(self, ms: int) -> str:
         """
         Convert milliseconds to SRT time format (HH:MM:SS,mmm).
@@ -234,22 +731,144 @@ class AudioTranscriber:
         end_time = self._ms_to_srt_time(end_ms)
         return f"{index}\n{start_time} --> {end_time}\n{text.strip()}\n"
 
-    def transcribe_file(self, audio_path: str, output_path: str = None, max_workers: int = 6, format: str = "srt", model_name: str = "Whisper", language: str = "en") -> str:
+    def _resolve_model(self, model_name: str) -> Tuple[str, str]:
+        """Return the (API base, model) pair serving the given model name."""
+        if model_name == "Malaysia Whisper" or model_name == "Whisper Malaysia":
+            return API_BASE_MALAYSIA, TRANSCRIPTION_MODEL_MALAYSIA
+        # Default to Whisper model
+        return API_BASE, TRANSCRIPTION_MODEL
+    
+    def segmentation_signature(self, segmentation: str) -> str:
+        """
+        Describe every setting that shapes the segments and how they are stitched together.
+        
+        Used in cache keys of whole transcripts, so tuning these settings invalidates
+        transcripts produced with the old ones.
+        """
+        parts = [segmentation, self.segment_length, self.overlap, SEAM_TOKENS_PER_SECOND, SEAM_SLACK_TOKENS]
+        if segmentation == "vad":
+            parts += [
+                VAD_FRAME_MS, VAD_MIN_SILENCE_MS, VAD_MIN_SPEECH_MS, VAD_SPEECH_PAD_MS,
+                VAD_THRESHOLD_MARGIN_DB, VAD_MIN_THRESHOLD_DBFS, VAD_MAX_THRESHOLD_DBFS,
+            ]
+        return "|".join(str(part) for part in parts)
+    
+    def _segment_source(self, audio_path: str, streaming: bool, segmentation: str) -> Iterator[AudioChunk]:
+        """
+        Yield the segments of audio_path for the requested decode and segmentation mode.
+        
+        Nothing is decoded until the first segment is requested, so the whole source can be
+        iterated from a worker thread.
+        """
+        # Either decode once into memory and slice segments as views of the PCM buffer,
+        # or stream segments out of the decoder as soon as each window is available
+        if segmentation == "vad":
+            pcm = None if streaming else self.decode_audio(audio_path)
+            found_speech = False
+            for chunk in self.iter_vad_chunks(self.stream_pcm(audio_path) if streaming else [pcm]):
+                found_speech = True
+                yield chunk
+            if not found_speech:
+                # Rather than send nothing (e.g. a very quiet recording), let the STT model decide
+                print("No speech detected by VAD, falling back to fixed windows")
+                yield from self.stream_pcm_chunks(audio_path) if streaming else self.split_pcm(pcm)
+        elif streaming:
+            yield from self.stream_pcm_chunks(audio_path)
+        else:
+            yield from self.split_pcm(self.decode_audio(audio_path))
+    
+    def _finish_transcript(self, results: Dict[int, str], spans: List[Tuple[int, int]], format: str, output_path: str) -> str:
         """
-        Transcribe a long audio file by splitting it into segments and processing them concurrently using threads.
+        Stitch per-segment results into the final transcript and save it to output_path.
+        
+        Args:
+            results: Transcribed text by segment index
+            spans: (start_ms, end_ms) of each segment
+            format: Output format ('txt' for plain text, 'srt' for subtitle format)
+            output_path: Path to save the transcription output
+            
+        Returns:
+            Full transcription text
+        """
+        full_transcription = ""
+        srt_segments = []
+        duration_ms = spans[-1][1] if spans else 0
+        
+        # Deduplicate the overlap text at each segment boundary
+        texts = self.stitch_segments([results.get(i, "") for i in range(len(spans))], spans)
+        
+        # Reconstruct full transcription in original segment order
+        for i, (start_ms, _) in enumerate(spans):
+            if texts[i]:
+                full_transcription += texts[i] + " "
+                
+                if format == "srt":
+                    # End at the start of the next segment (or the audio duration for the last segment),
+                    # or earlier if silence after this segment was dropped
+                    if i + 1 < len(spans):
+                        end_ms = min(spans[i][1], spans[i + 1][0])
+                    else:
+                        end_ms = duration_ms
+                    
+                    # Create SRT segment
+                    srt_segment = self._create_srt_segment(
+                        index=i + 1,
+                        start_ms=start_ms,
+                        end_ms=end_ms,
+                        text=texts[i]
+                    )
+                    srt_segments.append(srt_segment)
+        
+        # Write output to file based on format
+        if format == "srt":
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(srt_segments))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(full_transcription.strip())
+        
+        print(f"\nFull transcription saved to: {output_path}")
+        
+        if format == "srt":
+            return '\n'.join(srt_segments)
+        else:
+            return full_transcription.strip()
+    
+    async def transcribe_file_async(self, audio_path: str, output_path: str = None, max_concurrency: int = 6, format: str = "srt", model_name: str = "Whisper", language: str = "en", streaming: bool = False, segmentation: str = "fixed", job_id: str = None, progress_callback: Callable[[TranscriptionProgress], None] = None) -> str:
+        """
+        Transcribe a long audio file by decoding it into segments and sending them to the
+        STT API concurrently on the running event loop.
         Returns the full transcription text.
         
+        Decoding and segmentation run in the shared decode process pool (or a worker thread
+        when DECODE_WORKERS is 0), so CPU-bound work never blocks the loop and a burst of
+        jobs decodes on all cores while their segments are sent out. Every STT request takes
+        a slot from the process-wide stt_scheduler, which bounds in-flight requests per
+        endpoint across all jobs and shares slots between jobs round-robin.
+        Transient failures are retried with capped exponential backoff; a failed segment
+        releases its slot and queues again behind the segments already waiting.
+        Segment results are kept in the on-disk segment_cache, so a rerun of the same audio
+        only sends the segments that have not been transcribed yet.
+        
         Args:
             audio_path: Path to the input audio file
             output_path: Path to save the transcription output (optional)
-            max_workers: Maximum number of worker threads to use for concurrent processing
+            max_concurrency: Hint for this job's maximum number of STT requests in flight
             format: Output format ('txt' for plain text, 'srt' for subtitle format)
             model_name: Name of the model to use for transcription ("Whisper" or "Malaysia Whisper")
             language: Language code for transcription ("en" for English, "ms" for Malay)
+            streaming: Send segments while the file is still being decoded
+            segmentation: 'fixed' for overlapping segment_length windows, 'vad' to cut on pauses and drop silence
+            job_id: Identifier used to share STT capacity fairly between jobs (generated if omitted)
+            progress_callback: Called on the event loop with a TranscriptionProgress each time a segment finishes
             
         Returns:
             Full transcription text
+            
+        Raises:
+            IncompleteTranscriptionError: If some segments still failed after all retries
         """
+        job_id = job_id or uuid.uuid4().hex
         if output_path is None:
             if format == "srt":
                 output_path = Path(audio_path).stem + "_transcription.srt"
@@ -257,122 +876,149 @@ class AudioTranscriber:
                 output_path = Path(audio_path).stem + "_transcription.txt"
         
         # Set API base and model based on model_name
-        if model_name == "Malaysia Whisper" or model_name == "Whisper Malaysia":
-            api_base = API_BASE_MALAYSIA
-            model = TRANSCRIPTION_MODEL_MALAYSIA
-        else:  # Default to Whisper model
-            api_base = API_BASE
-            model = TRANSCRIPTION_MODEL
-        lang = language  # Use the requested language
+        api_base, model = self._resolve_model(model_name)
         
         print(f"Processing audio file: {audio_path}")
-        print(f"max_workers parameter value in transcribe_file method: {max_workers}")
         print(f"Output format: {format}")
+        print(f"Segmentation: {segmentation}")
+        print(f"Starting async transcription with up to {max_concurrency} requests in flight")
         
-        # Split audio into segments
-        segment_files, temp_dir_created = self.split_audio(audio_path)
-        
-        # Get audio duration for end time calculation
-        if not audio_path.lower().endswith('.wav'):
-            # Convert to WAV to get duration
-            wav_path, _ = self.convert_to_wav(audio_path)
-            audio = AudioSegment.from_wav(wav_path)
-            duration_ms = len(audio)
-            # Clean up the converted WAV file
-            if os.path.exists(wav_path):
-                os.remove(wav_path)
-        else:
-            audio = AudioSegment.from_wav(audio_path)
-            duration_ms = len(audio)
-        
-        # Use ThreadPoolExecutor for concurrent processing
-        from concurrent.futures import ThreadPoolExecutor, as_completed
+        spans = []
+        # Dictionary to store results by their original index
+        results = {}
+        missing_segments = []
+        started = time.monotonic()
+        decoding_done = False
+        segments_done = 0
         
-        full_transcription = ""
-        srt_segments = []
-        total_segments = len(segment_files)
+        def report_progress():
+            if progress_callback is None:
+                return
+            eta_seconds = None
+            if decoding_done and segments_done:
+                eta_seconds = (time.monotonic() - started) / segments_done * (len(spans) - segments_done)
+            try:
+                progress_callback(TranscriptionProgress(segments_done, len(spans), decoding_done, eta_seconds))
+            except Exception as e:
+                print(f"Progress callback failed: {str(e)}")
         
-        print(f"Starting concurrent transcription with {max_workers} workers. Max workers parameter value: {max_workers}")
+        async def transcribe_chunk(chunk: AudioChunk):
+            nonlocal segments_done
+            try:
+                await transcribe_with_retries(chunk)
+            finally:
+                segments_done += 1
+                report_progress()
         
-        # Calculate start times for each segment
-        start_times = []
-        step_size = self.segment_length - self.overlap
-        for i, start_ms in enumerate(range(0, duration_ms, step_size)):
-            start_times.append(start_ms)
-        
-        # Process segments concurrently using threads while preserving order
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all transcription tasks with their index to maintain order
-            future_to_index = {
-                executor.submit(self.transcribe_segment, segment_file, api_base, model, lang): i
-                for i, segment_file in enumerate(segment_files)
-            }
+        async def transcribe_with_retries(chunk: AudioChunk):
+            # Segments transcribed by an earlier run of this or another job need no STT call
+            cache_key = segment_cache_key(chunk.samples, api_base, model, language) if segment_cache.enabled else None
+            if cache_key is not None:
+                cached = await segment_cache.aget(cache_key)
+                if cached is not None:
+                    results[chunk.index] = cached
+                    print(f"Reused cached segment {chunk.index+1}: {chunk.start_ms // 1000}-{chunk.end_ms // 1000}s")
+                    return
             
-            # Dictionary to store results by their original index
-            results = {}
-            
-            # Process completed futures as they finish
-            for future in as_completed(future_to_index):
-                segment_index = future_to_index[future]
-                segment_file = segment_files[segment_index]
-                try:
-                    text = future.result()
-                    results[segment_index] = text
-                    print(f"Completed {segment_index+1}/{total_segments}: {segment_file}")
-                except Exception as e:
-                    print(f"Error transcribing {segment_file}: {str(e)}")
-                    results[segment_index] = ""  # Use empty string for failed transcriptions
+            attempt = 0
+            retry_deadline = None
+            while True:
+                attempt += 1
+                error = None
+                async with stt_scheduler.slot(api_base, job_id, max_concurrency):
+                    try:
+                        results[chunk.index] = await self.transcribe_segment_async(chunk, api_base, model, language)
+                        print(f"Completed segment {chunk.index+1}: {chunk.start_ms // 1000}-{chunk.end_ms // 1000}s")
+                    except Exception as e:
+                        error = e
+                
+                if error is None:
+                    # Written after the STT slot is released, so the next segment need not wait
+                    if cache_key is not None:
+                        await segment_cache.aput(cache_key, results[chunk.index])
+                    return
+                if not is_transient_stt_error(error):
+                    break
+                now = time.monotonic()
+                if retry_deadline is None:
+                    retry_deadline = now + STT_RETRY_BUDGET
+                if now >= retry_deadline:
+                    break
+                # Back off without holding a slot so healthy segments keep the endpoint busy
+                delay = min(stt_retry_delay(attempt), retry_deadline - now)
+                print(f"Segment {chunk.index+1} failed (attempt {attempt}): {str(error)}; "
+                      f"retrying in {delay:.1f}s ({retry_deadline - now:.0f}s of retry budget left)")
+                await asyncio.sleep(delay)
             
-            # Reconstruct full transcription in original segment order
-            for i in range(len(segment_files)):
-                if i in results:
-                    full_transcription += results[i] + " "
-                    
-                    if format == "srt" and i in results and results[i].strip():
-                        # Calculate end time for this segment
-                        # Use the start time of the next segment as end time, or the audio duration for the last segment
-                        if i + 1 < len(start_times):
-                            end_ms = start_times[i + 1]
-                        else:
-                            end_ms = duration_ms
-                        
-                        # Create SRT segment
-                        srt_segment = self._create_srt_segment(
-                            index=i + 1,
-                            start_ms=start_times[i],
-                            end_ms=end_ms,
-                            text=results[i]
-                        )
-                        srt_segments.append(srt_segment)
+            print(f"Error transcribing segment {chunk.index+1}: {str(error)}")
+            results[chunk.index] = ""  # Use empty string for failed transcriptions
+            missing_segments.append({
+                "index": chunk.index,
+                "start_ms": chunk.start_ms,
+                "end_ms": chunk.end_ms,
+                "error": str(error)
+            })
         
-        # Write output to file based on format
-        if format == "srt":
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(srt_segments))
+        # Start a request for each segment as soon as the decoder produces it
+        tasks = []
+        if DECODE_WORKERS > 0:
+            segments = PooledSegments(self, audio_path, streaming, segmentation)
         else:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(full_transcription.strip())
-        
-        print(f"\nFull transcription saved to: {output_path}")
-        
-        # Clean up segment files
-        for segment_file in segment_files:
-            if os.path.exists(segment_file):
-                os.remove(segment_file)
-        
-        # Clean up the entire temporary directory if it exists
-        if temp_dir_created.exists() and temp_dir_created.is_dir():
-            shutil.rmtree(temp_dir_created)
-            print(f"Cleaned up temporary directory: {temp_dir_created}")
+            segments = self._segment_source(audio_path, streaming, segmentation)
+        try:
+            while (chunk := await asyncio.to_thread(next, segments, None)) is not None:
+                spans.append((chunk.start_ms, chunk.end_ms))
+                tasks.append(asyncio.create_task(transcribe_chunk(chunk)))
+            decoding_done = True
+            report_progress()
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            if isinstance(segments, PooledSegments):
+                segments.cancel()
+            raise
         
+        print(f"Transcribed {len(spans) - len(missing_segments)}/{len(spans)} segments")
+        transcript = self._finish_transcript(results, spans, format, output_path)
+        if missing_segments:
+            raise IncompleteTranscriptionError(transcript, sorted(missing_segments, key=lambda segment: segment["index"]))
+        return transcript
+    
+    def transcribe_file(self, audio_path: str, output_path: str = None, max_workers: int = 6, format: str = "srt", model_name: str = "Whisper", language: str = "en", streaming: bool = False, segmentation: str = "fixed", progress_callback: Callable[[TranscriptionProgress], None] = None) -> str:
+        """
+        Transcribe a long audio file from synchronous code such as scripts.
+        Runs transcribe_file_async on a new event loop, so it must not be called from a running loop.
         
-        if format == "srt":
-            return '\n'.join(srt_segments)
-        else:
-            # Apply post-processing to remove repeated phrases/words using NLTK
-            processed_transcription = full_transcription.strip()
-            return processed_transcription
-
+        Args:
+            audio_path: Path to the input audio file
+            output_path: Path to save the transcription output (optional)
+            max_workers: Hint for the maximum number of STT requests in flight
+            format: Output format ('txt' for plain text, 'srt' for subtitle format)
+            model_name: Name of the model to use for transcription ("Whisper" or "Malaysia Whisper")
+            language: Language code for transcription ("en" for English, "ms" for Malay)
+            streaming: Send segments while the file is still being decoded
+            segmentation: 'fixed' for overlapping segment_length windows, 'vad' to cut on pauses and drop silence
+            progress_callback: Called with a TranscriptionProgress each time a segment finishes
+            
+        Returns:
+            Full transcription text
+            
+        Raises:
+            IncompleteTranscriptionError: If some segments still failed after all retries
+        """
+        return asyncio.run(self.transcribe_file_async(
+            audio_path,
+            output_path=output_path,
+            max_concurrency=max_workers,
+            format=format,
+            model_name=model_name,
+            language=language,
+            streaming=streaming,
+            segmentation=segmentation,
+            progress_callback=progress_callback
+        ))
+    
     def remove_repeated_phrases_nltk(self, text: str) -> str:
         """
         Remove repeated phrases from transcription using NLTK.
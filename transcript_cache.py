@@ -0,0 +1,25 @@
+"""
+On-disk cache of whole transcripts.
+
+A recording uploaded again and transcribed with the same settings gets the
+transcript of the earlier upload without any STT calls. Transcripts are keyed by
+the audio's hash and the settings that change the STT output (see
+app.transcript_cache_key) and kept in an SQLite file on the API server; worker
+nodes on other hosts add theirs through it. The least recently used transcripts
+are evicted once it holds more than TRANSCRIPT_CACHE_MAX_ENTRIES, and a
+transcript's entry is removed when the transcript is deleted.
+"""
+
+import os
+
+from sqlite_cache import SQLiteLRUCache
+
+TRANSCRIPT_CACHE_PATH = os.environ.get(
+    "TRANSCRIPT_CACHE_PATH", os.path.join(os.environ.get("DATA_DIR", "data"), "transcript_cache.db")
+)
+
+# Maximum number of cached transcripts; 0 disables the cache
+TRANSCRIPT_CACHE_MAX_ENTRIES = int(os.environ.get("TRANSCRIPT_CACHE_MAX_ENTRIES", "1000"))
+
+# Shared by every request handler and transcription job in the process
+transcript_cache = SQLiteLRUCache(TRANSCRIPT_CACHE_PATH, TRANSCRIPT_CACHE_MAX_ENTRIES, "transcript")
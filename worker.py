@@ -0,0 +1,62 @@
+"""
+Standalone worker for transcription and report jobs.
+
+Runs the same job handlers as the API server; set RUN_WORKERS=0 on an API server
+that should only accept requests. The worker takes the same .env settings as the
+API server. There are two ways to run it:
+
+- On the API server's host: it takes jobs from the shared queue (QUEUE_PATH) and
+  writes results to the shared storage (DATA_DIR, UPLOAD_DIR and REPORTS_DIR). The
+  queue and the record store are SQLite databases in WAL mode, which relies on
+  shared memory and file locks that network filesystems (NFS, SMB) do not
+  provide, so these directories must not be shared with other machines.
+- On any other host, with WORKER_API_URL set to the API server's URL and
+  WORKER_TOKEN to the token the API server was started with: it leases jobs,
+  reads and writes records, downloads uploaded audio and uploads finished report
+  documents through the API server's /internal endpoints, and needs no shared
+  filesystem. Its own DATA_DIR only holds its STT and text model caches.
+
+Any number of workers can run in either way at the same time.
+
+Usage:
+    python worker.py
+"""
+
+import asyncio
+import logging
+import signal
+
+import app
+
+logger = logging.getLogger(__name__)
+
+
+async def run_worker():
+    """Run job workers until SIGINT or SIGTERM, then hand running jobs back to the queue."""
+    if app.STORAGE_BACKEND != "sqlite" and not app.WORKER_API_URL:
+        # JSON file locks only protect writers inside one process
+        raise SystemExit("worker.py needs STORAGE_BACKEND=sqlite to share data with the API server")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            # Windows: Ctrl+C raises KeyboardInterrupt instead
+            pass
+
+    app.start_job_workers()
+    logger.info(f"Worker running jobs from {app.WORKER_API_URL or app.QUEUE_PATH}")
+    try:
+        await stop.wait()
+    finally:
+        logger.info("Stopping worker...")
+        await app.stop_job_workers()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run_worker())
+    except KeyboardInterrupt:
+        pass